@@ -4,23 +4,90 @@ import pymongo
 from bson.objectid import ObjectId
 import bcrypt
 import logging
-from datetime import datetime, time
 from dotenv import load_dotenv
 from datetime import datetime, time, date, timedelta
 from typing import Tuple, Dict, Any, List, Optional
 import urllib.parse
 import functools
+import threading
 
 # Load environment variables and configure logging
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# bcrypt work factor: 10 (~60 ms) is the OWASP minimum and keeps signup/login snappy;
+# raise deliberately via the environment as hardware gets faster
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+# bcrypt only reads the first 72 bytes of a password
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+def password_bytes(password: str) -> bytes:
+    """Encode a password for bcrypt, truncated explicitly to the bytes bcrypt actually uses"""
+    return password.encode('utf-8')[:BCRYPT_MAX_PASSWORD_BYTES]
+
+# bcrypt releases the GIL while hashing, so concurrent sessions already hash in parallel
+def hash_password(password: str) -> bytes:
+    """bcrypt-hash a password at the configured work factor"""
+    return bcrypt.hashpw(password_bytes(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+def check_password(password: str, hashed: bytes) -> bool:
+    """Verify a password against its bcrypt hash"""
+    return bcrypt.checkpw(password_bytes(password), hashed)
+
+def needs_rehash(hashed: bytes) -> bool:
+    """True when a bcrypt hash ($2b$<cost>$...) was made with a work factor below BCRYPT_ROUNDS"""
+    try:
+        return int(hashed.split(b"$")[2]) < BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+def to_object_id(value) -> ObjectId:
+    """Return value as an ObjectId; existing ObjectIds pass through, strings are parsed"""
+    if isinstance(value, ObjectId):
+        return value
+    return ObjectId(value)
+
+# Ride ids reserved per counter round trip; unused ids in a block are skipped on restart
+RIDE_ID_BLOCK_SIZE = 100
+
+# Rides are copied to rides_archive and expire from rides this long after they end
+RIDE_ARCHIVE_AFTER_DAYS = 730
+# Past rides shown per page in Ride History
+PAST_RIDES_PAGE_SIZE = 20
+# User Management renders this many user expanders per page
+USERS_PAGE_SIZE = 20
+
+# Ride listings sort on start_date and filter a range on end_date: sort key first (ESR),
+# so rows come back in order and the end_date filter is checked on the index keys
+RIDE_LISTING_INDEX = [("start_date", pymongo.ASCENDING), ("end_date", pymongo.ASCENDING)]
+
+@st.cache_resource
+def get_mongo_client(uri):
+    """One pooled client per URI for the whole process; pymongo's pool handles concurrency"""
+    return pymongo.MongoClient(
+        uri,
+        appname="creedbot",  # Name it for server-side pool metrics
+        maxPoolSize=50,
+        minPoolSize=5,
+        maxConnecting=10,  # Default of 2 serializes connects during login bursts
+        maxIdleTimeMS=60000,
+        serverSelectionTimeoutMS=5000,
+        connectTimeoutMS=10000,
+        socketTimeoutMS=30000,  # Slow queries fail instead of hanging, without killing healthy sockets early
+        retryWrites=True,
+        retryReads=True,
+        compressors="zlib"  # Built into Python; shrinks the ride documents on the wire
+    )
+
 class DatabaseManager:
     def __init__(self, uri, db_name):
         try:
-            self.client = pymongo.MongoClient(uri)
+            self.client = get_mongo_client(uri)
             self.db = self.client[db_name]
+            self._id_lock = threading.Lock()
+            self._id_low = self._id_high = 0
             self._ensure_ride_counter()
+            self._ensure_indexes()
             logging.info("Connected to MongoDB")
         except Exception as e:
             logging.error(f"Failed to connect to MongoDB: {e}")
@@ -30,35 +97,121 @@ class DatabaseManager:
         if not self.db.counters.find_one({"_id": "ride_id"}):
             self.db.counters.insert_one({"_id": "ride_id", "seq": 200})
 
+    def _ensure_indexes(self):
+        """Create indexes for the hot lookup paths (login, ride listings, user filters)"""
+        for field in ("phone", "email"):
+            self._ensure_unique_index("users", field)
+        self._ensure_unique_index("rides", "ride_id")
+        self._ensure_unique_index("meeting_points", "name")
+        # User Management's status/role filters
+        self.db.users.create_index([("status", pymongo.ASCENDING), ("roles", pymongo.ASCENDING)])
+
+        rides = self.db.rides
+        # Upcoming/past listings: sort on start_date, range on end_date
+        rides.create_index(RIDE_LISTING_INDEX)
+        # TTL only removes rides already copied to rides_archive (see archive_old_rides)
+        rides.create_index(
+            [("end_date", pymongo.ASCENDING)],
+            expireAfterSeconds=RIDE_ARCHIVE_AFTER_DAYS * 86400,
+            partialFilterExpression={"archived": True}
+        )
+
+    def _ensure_unique_index(self, collection_name, field):
+        collection = self.db[collection_name]
+        try:
+            collection.create_index([(field, pymongo.ASCENDING)], unique=True)
+        except pymongo.errors.OperationFailure as e:
+            # Existing duplicates prevent a unique index; fall back to a plain one
+            logging.warning(f"Could not create unique index on {collection_name}.{field}: {e}")
+            collection.create_index([(field, pymongo.ASCENDING)])
+
     def get_collection(self, name):
         return self.db[name]
 
+    def get_fast_collection(self, name):
+        """Collection whose writes are acknowledged by the primary alone (w=1), for idempotent writes"""
+        return self.db.get_collection(name, write_concern=pymongo.WriteConcern(w=1))
+
     def insert_document(self, collection_name, document):
         return self.get_collection(collection_name).insert_one(document)
 
-    def find_document(self, collection_name, query):
-        return self.get_collection(collection_name).find_one(query)
+    def find_document(self, collection_name, query, projection=None):
+        return self.get_collection(collection_name).find_one(query, projection)
 
-    def update_document(self, collection_name, query, update):
-        return self.get_collection(collection_name).update_one(query, {'$set': update})
+    def update_document(self, collection_name, query, update, fast=False):
+        collection = self.get_fast_collection(collection_name) if fast else self.get_collection(collection_name)
+        return collection.update_one(query, {'$set': update})
 
-    def get_next_ride_id(self):
-        counter = self.get_collection("counters").find_one_and_update(
-            {"_id": "ride_id"},
-            {"$inc": {"seq": 1}},
-            return_document=pymongo.ReturnDocument.AFTER
+    def update_one_raw(self, collection_name, query, update, fast=False):
+        """update_one with the update document passed through as-is (operators like $addToSet/$pull)"""
+        collection = self.get_fast_collection(collection_name) if fast else self.get_collection(collection_name)
+        return collection.update_one(query, update)
+
+    def find_and_update_document(self, collection_name, query, update, projection=None, fast=False,
+                                 array_filters=None):
+        """Apply a $set to the first matching document in one round trip; returns None if nothing matched"""
+        collection = self.get_fast_collection(collection_name) if fast else self.get_collection(collection_name)
+        return collection.find_one_and_update(
+            query, {'$set': update}, projection=projection, array_filters=array_filters
         )
-        return counter['seq']
+
+    def get_next_ride_id(self):
+        """Hand out ride ids from a block reserved in the counter (hi-lo allocation)"""
+        with self._id_lock:
+            if self._id_low >= self._id_high:
+                counters = self.get_fast_collection("counters")
+                counter = counters.find_one_and_update(
+                    {"_id": "ride_id"},
+                    {"$inc": {"seq": RIDE_ID_BLOCK_SIZE}},
+                    return_document=pymongo.ReturnDocument.AFTER
+                )
+                self._id_high = counter['seq'] + 1
+                self._id_low = self._id_high - RIDE_ID_BLOCK_SIZE
+            ride_id = self._id_low
+            self._id_low += 1
+            return ride_id
 
 class UserManager:
+    # Fields shown on the User Management page
+    ADMIN_PROJECTION = {
+        "name": 1,
+        "email": 1,
+        "phone": 1,
+        "emergency_contact": 1,
+        "roles": 1,
+        "status": 1,
+        "created_at": 1
+    }
+
+    # Fields needed to render riders in the attendance and pre-ride views
+    # (emergency contacts are fetched separately, only when shown)
+    RIDER_PROJECTION = {
+        "name": 1,
+        "phone": 1,
+        "roles": 1,
+        "stats": 1,
+        "participation": 1,
+        "is_existing_user": 1
+    }
+
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.collection = "users"
 
+    @staticmethod
+    def participation_of(user: Optional[Dict]) -> Dict[str, Any]:
+        """Read the denormalized ride participation counters from a user document"""
+        participation = (user or {}).get('participation', {})
+        roles = participation.get('roles', {})
+        return {
+            "total_days_attended": participation.get('total_days_attended', 0),
+            "roles": {role: roles.get(role, 0) for role in ("lead", "sweep", "pilot", "pilot2")}
+        }
+
     
     def _is_first_user(self):
         """Check if this is the first user being registered"""
-        return self.db_manager.get_collection(self.collection).count_documents({}) == 0
+        return self.db_manager.find_document(self.collection, {}, projection={"_id": 1}) is None
     
     def create_user(self, name, phone, emergency_contact, email, password,
                 is_existing_user=False, previous_stats=None, previous_rides=None):
@@ -72,7 +225,7 @@ class UserManager:
       if existing_user:
           raise ValueError("User with this phone or email already exists")
 
-      hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+      hashed_password = hash_password(password)
       
       # Initialize roles - first user gets admin
       roles = ["rider"]
@@ -98,10 +251,16 @@ class UserManager:
               "ride_marshals": stats.get('ride_marshals', 0),
               "total_rides": stats.get('total_rides', 0)  # Include total_rides in stats
           },
+          # Current system counters, kept up to date by RideManager.update_ride_day
+          "participation": {
+              "total_days_attended": 0,
+              "roles": {"lead": 0, "sweep": 0, "pilot": 0, "pilot2": 0}
+          },
           "created_at": datetime.utcnow()
       }
 
       result = self.db_manager.insert_document(self.collection, user_data)
+      self.get_all_users.clear()
       return result.inserted_id
 
 
@@ -110,86 +269,147 @@ class UserManager:
             self.collection,
             {"$or": [{"phone": phone_or_email}, {"email": phone_or_email}]}
         )
-        if user and bcrypt.checkpw(password.encode('utf-8'), user['password']):
+        if user and check_password(password, user['password']):
+            if needs_rehash(user['password']):
+                # The plaintext is only available now: raise the hash to the configured cost
+                try:
+                    self.db_manager.update_document(
+                        self.collection,
+                        {"_id": user['_id']},
+                        {"password": hash_password(password)}
+                    )
+                except Exception as e:
+                    logging.error(f"Error rehashing password: {e}")
             return user
         return None
 
     def update_user_role(self, user_id, new_role):
-        user = self.db_manager.find_document(self.collection, {"_id": ObjectId(user_id)})
-        if not user:
+        result = self.db_manager.update_one_raw(
+            self.collection,
+            {"_id": to_object_id(user_id)},
+            {"$addToSet": {"roles": new_role}}
+        )
+        if not result.matched_count:
             raise ValueError("User not found")
-        
-        current_roles = user.get('roles', [])
-        if new_role not in current_roles:
-            current_roles.append(new_role)
-            self.db_manager.update_document(
-                self.collection,
-                {"_id": ObjectId(user_id)},
-                {"roles": current_roles}
-            )
-            return True
-        return False
-    def update_user_status(self, user_id: str, status: str) -> bool:
-        """Update user status (active/blocked)"""
-        try:
-            self.db_manager.update_document(
-                self.collection,
-                {"_id": ObjectId(user_id)},
-                {"status": status}
-            )
-            return True
-        except Exception as e:
-            logging.error(f"Error updating user status: {e}")
-            return False
+        if result.modified_count:
+            self.get_all_users.clear()
+        return result.modified_count > 0
 
-    def update_user_roles(self, user_id: str, roles: List[str]) -> bool:
-        """Update user roles"""
+    def bulk_update_users(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """Apply several users' field updates ({user_id: {field: value}}) in one bulk write"""
         try:
-            self.db_manager.update_document(
-                self.collection,
-                {"_id": ObjectId(user_id)},
-                {"roles": roles}
-            )
+            operations = [
+                pymongo.UpdateOne({"_id": to_object_id(user_id)}, {"$set": fields})
+                for user_id, fields in updates.items() if fields
+            ]
+            if operations:
+                self.db_manager.get_collection(self.collection).bulk_write(operations, ordered=False)
+                self.get_all_users.clear()
             return True
         except Exception as e:
-            logging.error(f"Error updating user roles: {e}")
+            logging.error(f"Error applying bulk user updates: {e}")
             return False
 
     @st.cache_data(ttl=300)  # Cache for 5 minutes
-    def get_all_users(_self) -> List[Dict]:
-        """Get all users with their details"""
-        return list(_self.db_manager.get_collection(_self.collection).find())
+    def get_all_users(_self, status: Optional[str] = None, role: Optional[str] = None,
+                      projection: Optional[Dict[str, int]] = None) -> List[Dict]:
+        """
+        Get users with their details (never the password hash unless projected explicitly),
+        optionally filtered server-side by status and role
+        """
+        query = {}
+        if status:
+            # Users created without a status are Active
+            query["status"] = {"$in": [status, None]} if status == "Active" else status
+        if role:
+            query["roles"] = role
+        return list(_self.db_manager.get_collection(_self.collection).find(query, projection or {"password": 0}))
     
     @st.cache_data(ttl=300)  # Cache for 5 minutes
     def get_registered_users_for_ride(_self, ride_id: int) -> List[Dict]:
         """Get all users registered for a specific ride"""
-        ride = _self.db_manager.find_document("rides", {"ride_id": ride_id})
+        ride = _self.db_manager.find_document("rides", {"ride_id": ride_id}, projection={"participants": 1})
         if not ride:
             return []
             
-        participant_ids = ride.get('participants', [])
-        participant_objs = []
-        
+        users = _self.get_users_by_ids(ride.get('participants', []), _self.RIDER_PROJECTION)
+        # Stringify ids once per cache miss; the views key everything by the string form
+        for user in users:
+            user['id_str'] = str(user['_id'])
+        return users
+
+    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    def get_riders_by_ids(_self, user_ids: Tuple[str, ...]) -> Dict[str, Dict]:
+        """Riders for the given ids in one query, keyed by id string (also set as id_str)"""
+        riders = {}
+        for user in _self.get_users_by_ids(list(user_ids), _self.RIDER_PROJECTION):
+            user['id_str'] = str(user['_id'])
+            riders[user['id_str']] = user
+        return riders
+
+    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    def get_emergency_contacts(_self, user_ids: Tuple[str, ...]) -> Dict[str, str]:
+        """Emergency contacts for the given users, keyed by user id"""
+        return {
+            str(user['_id']): user.get('emergency_contact', '')
+            for user in _self.get_users_by_ids(list(user_ids), {"emergency_contact": 1})
+        }
+
+    def get_users_by_ids(self, user_ids: List[Any], projection: Optional[Dict[str, int]] = None) -> List[Dict]:
+        """Fetch several users in one round trip; accepts string or ObjectId ids"""
         # Convert string IDs to ObjectId if needed
         obj_ids = []
-        for user_id in participant_ids:
+        for user_id in user_ids:
             try:
-                if isinstance(user_id, str):
-                    obj_ids.append(ObjectId(user_id))
-                else:
-                    obj_ids.append(user_id)
+                obj_ids.append(to_object_id(user_id))
             except Exception as e:
                 logging.error(f"Error converting user ID: {e}")
                 
-        if obj_ids:
-            participant_objs = list(_self.db_manager.get_collection(_self.collection).find(
-                {"_id": {"$in": obj_ids}}
-            ))
-            
-        return participant_objs
-
+        if not obj_ids:
+            return []
+        return list(self.db_manager.get_collection(self.collection).find(
+            {"_id": {"$in": obj_ids}},
+            projection or {"password": 0}
+        ))
+
+# WhatsApp announcement for a new ride; only the ride's fields are substituted
+_WHATSAPP_TMPL = (
+    "🏍️ *{name}*\n"
+    "\n"
+    "📅 Date: {start_date}\n"
+    "{end_line}"
+    "⏰ Meeting Time: {meeting_time}\n"
+    "🚦 Departure Time: {departure_time}\n"
+    "📍 Meeting Point: {meeting_point}\n"
+    "\n"
+    "📝 Description:\n"
+    "{description}\n"
+    "\n"
+    "👮‍♂️ Ride Marshal: {marshal_name}\n"
+    "📱 Contact: {marshal_phone}\n"
+    "\n"
+    "🎫 Ride ID: #{ride_id}\n"
+    "⏳ Duration: {days}\n"
+    "\n"
+    "Please confirm your participation by responding in the group.\n"
+    "Remember to carry your gear and necessary documents.\n"
+    "\n"
+    "#BikeLife #RideSafe"
+).format
 
 class RideManager:
+    # Fields rendered on a ride history card
+    RIDE_CARD_PROJECTION = {
+        "ride_id": 1,
+        "name": 1,
+        "ride_marshal.name": 1,
+        "meeting_point": 1,
+        "start_date": 1,
+        "meeting_time": 1,
+        "arrival_time": 1,
+        "description": 1
+    }
+
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.collection = "rides"
@@ -200,30 +420,19 @@ class RideManager:
             "Point D - West Gate"
         ]
 
-    def _ensure_meeting_points(self):
-        """Initialize meeting points collection if it doesn't exist"""
-        if not self.db_manager.get_collection("meeting_points").find_one({}):
-            default_points = [
-                "Point A - North City",
-                "Point B - South Plaza",
-                "Point C - East Bridge",
-                "Point D - West Gate"
-            ]
-            self.db_manager.get_collection("meeting_points").insert_many(
-                [{"name": point} for point in default_points]
-            )
-
     @st.cache_data(ttl=300)  # Cache for 5 minutes
     def get_meeting_points(_self):
         """Get all meeting points"""
-        return [doc["name"] for doc in _self.db_manager.get_collection("meeting_points").find()]
+        return [doc["name"] for doc in _self.db_manager.get_collection("meeting_points").find({}, {"_id": 0, "name": 1})]
 
     def add_meeting_point(self, point_name: str) -> bool:
         """Add a new meeting point"""
         try:
-            if not self.db_manager.get_collection("meeting_points").find_one({"name": point_name}):
-                self.db_manager.get_collection("meeting_points").insert_one({"name": point_name})
-                return True
+            # The unique index on name rejects duplicates, so no existence probe is needed
+            self.db_manager.get_collection("meeting_points").insert_one({"name": point_name})
+            self.get_meeting_points.clear()
+            return True
+        except pymongo.errors.DuplicateKeyError:
             return False
         except Exception as e:
             logging.error(f"Error adding meeting point: {e}")
@@ -233,6 +442,8 @@ class RideManager:
         """Remove a meeting point"""
         try:
             result = self.db_manager.get_collection("meeting_points").delete_one({"name": point_name})
+            if result.deleted_count:
+                self.get_meeting_points.clear()
             return result.deleted_count > 0
         except Exception as e:
             logging.error(f"Error removing meeting point: {e}")
@@ -258,58 +469,77 @@ class RideManager:
     def update_ride_status(self, ride_id: int, status: str) -> bool:
         """Update the status of a ride"""
         try:
-            self.db_manager.update_document(
+            result = self.db_manager.update_document(
                 self.collection,
                 {"ride_id": ride_id},
-                {"status": status}
+                {"status": status},
+                fast=True
             )
             # Clear cache when updating ride status
-            self.get_ride_by_id.clear()
-            self.get_upcoming_rides.clear()
-            self.get_past_rides.clear()
-            return True
+            if result.modified_count:
+                self.get_ride_by_id.clear()
+                self.get_upcoming_rides.clear()
+                self.get_all_rides_sorted.clear()
+                self.get_past_rides.clear()
+            return result.matched_count > 0
         except Exception as e:
             logging.error(f"Error updating ride status: {e}")
             return False
 
     @st.cache_data(ttl=60)  # Cache for 1 minute
     def get_upcoming_rides(_self) -> List[Dict]:
-        """Get all upcoming rides"""
+        """Get all upcoming rides, without the per-day attendance and roles"""
         current_date = datetime.now()
-        return list(_self.db_manager.get_collection(_self.collection).find({
+        return _self._with_date_strings(_self.db_manager.get_collection(_self.collection).find({
             "end_date": {"$gte": current_date}
-        }).sort("start_date", 1))
+        }, {"days": 0}).sort("start_date", 1).hint(RIDE_LISTING_INDEX))
 
     @st.cache_data(ttl=300)  # Cache for 5 minutes
-    def get_past_rides(_self) -> List[Dict]:
-        """Get all past rides"""
+    def get_past_rides(_self, projection: Optional[Dict[str, int]] = None,
+                       limit: int = 0) -> List[Dict]:
+        """Get past rides, newest first; optionally projected and capped at limit (0 = all)"""
         current_date = datetime.now()
         return list(_self.db_manager.get_collection(_self.collection).find({
             "end_date": {"$lt": current_date}
-        }).sort("start_date", -1))
+        }, projection).sort("start_date", -1).hint(RIDE_LISTING_INDEX).limit(limit))
+
+    @st.cache_data(ttl=60)  # Cache for 1 minute
+    def get_all_rides_sorted(_self) -> List[Dict]:
+        """Upcoming rides (soonest first) followed by past rides (latest first), from one query"""
+        current_date = datetime.now()
+        rides = list(_self.db_manager.get_collection(_self.collection).find().sort("start_date", -1))
+        upcoming = [ride for ride in rides if ride['end_date'] >= current_date]
+        upcoming.reverse()
+        past = [ride for ride in rides if ride['end_date'] < current_date]
+        return _self._with_date_strings(upcoming + past)
+
+    @staticmethod
+    def _with_date_strings(rides) -> List[Dict]:
+        """Add display dates to each ride, so views format them once per cache miss rather than per rerun"""
+        rides = list(rides)
+        for ride in rides:
+            ride['start_date_str'] = ride['start_date'].strftime('%Y-%m-%d')
+            ride['end_date_str'] = ride['end_date'].strftime('%Y-%m-%d')
+        return rides
 
     def create_ride(self, name: str, meeting_point: str, meeting_time: time,
                    departure_time: time, arrival_time: time, 
                    start_date: datetime, end_date: datetime, 
-                   description: str, creator_id: str) -> Tuple[str, str]:
+                   description: str, creator: Dict) -> Tuple[str, str]:
         """
         Create a new ride with multi-day support
+        creator: the logged-in user's document, used as ride marshal
         Returns: Tuple of (ride_id, whatsapp_message)
         """
         ride_id = self.db_manager.get_next_ride_id()
-        
-        # Get creator details for ride marshal
-        creator = self.db_manager.find_document("users", {"_id": ObjectId(creator_id)})
+        creator_id = str(creator["_id"])
         
         # Initialize days list
-        days = []
-        current_date = start_date
         day_count = (end_date - start_date).days + 1
-        
-        for day in range(day_count):
-            days.append({
+        days = [
+            {
                 "day": day + 1,
-                "date": current_date + timedelta(days=day),
+                "date": start_date + timedelta(days=day),
                 "roles": {
                     "lead": None,
                     "sweep": None,
@@ -318,7 +548,9 @@ class RideManager:
                 },
                 "has_second_pilot": False,  # Flag to indicate if a second pilot is needed
                 "attendance": []
-            })
+            }
+            for day in range(day_count)
+        ]
 
         ride_data = {
             "ride_id": ride_id,
@@ -346,6 +578,7 @@ class RideManager:
         
         # Clear caches when creating a new ride
         self.get_upcoming_rides.clear()
+        self.get_all_rides_sorted.clear()
         
         return result.inserted_id, self._generate_whatsapp_message(ride_data)
 
@@ -354,48 +587,238 @@ class RideManager:
                        has_second_pilot: bool) -> bool:
         """Update attendance and roles for a specific day of a ride"""
         try:
-            ride = self.get_ride_by_id(ride_id)
-            if not ride or day_number > len(ride['days']):
-                return False
-
-            ride['days'][day_number - 1]['attendance'] = attendance
-            ride['days'][day_number - 1]['roles'] = roles
-            ride['days'][day_number - 1]['has_second_pilot'] = has_second_pilot
-
-            self.db_manager.update_document(
+            # Positional update of the matching day only; the day's previous state
+            # comes back with it and drives the per-user counter deltas
+            before = self.db_manager.find_and_update_document(
                 self.collection,
-                {"ride_id": ride_id},
-                {"days": ride['days']}
+                {"ride_id": ride_id, "days.day": day_number},
+                {
+                    "days.$.attendance": attendance,
+                    "days.$.roles": roles,
+                    "days.$.has_second_pilot": has_second_pilot
+                },
+                projection={"days.$": 1}
             )
+            if not before:
+                return False
+            
+            self._apply_participation_deltas([(before['days'][0], attendance, roles)])
             
             # Clear caches that might contain this ride's data
             self.get_ride_by_id.clear()
+            self.get_upcoming_rides.clear()
+            self.get_all_rides_sorted.clear()
+            self.get_past_rides.clear()
             
             return True
         except Exception as e:
             logging.error(f"Error updating ride day: {e}")
             return False
 
-    def add_participant(self, ride_id: int, user_id: str) -> bool:
-        """Add a participant to a ride"""
+    def update_ride_days(self, ride_id: int, day_updates: Dict[int, Dict[str, Any]]) -> bool:
+        """
+        Update several days of a ride in one findAndModify, then adjust the counters in one bulk write
+        day_updates: {day_number: {"attendance", "roles", "has_second_pilot"}}
+        """
         try:
-            ride = self.get_ride_by_id(ride_id)
-            if not ride:
+            if not day_updates:
+                return False
+            # One array filter per day; the pre-image of every day comes back atomically
+            # with the write, so a concurrent save cannot skew the counter deltas
+            update, array_filters = {}, []
+            for i, (day_number, day_update) in enumerate(day_updates.items()):
+                update[f"days.$[d{i}].attendance"] = day_update['attendance']
+                update[f"days.$[d{i}].roles"] = day_update['roles']
+                update[f"days.$[d{i}].has_second_pilot"] = day_update['has_second_pilot']
+                array_filters.append({f"d{i}.day": day_number})
+            before = self.db_manager.find_and_update_document(
+                self.collection,
+                {"ride_id": ride_id},
+                update,
+                projection={"days": 1},
+                array_filters=array_filters
+            )
+            if not before:
                 return False
 
-            participants = ride.get('participants', [])
-            if user_id not in participants:
-                participants.append(user_id)
-                self.db_manager.update_document(
-                    self.collection,
-                    {"ride_id": ride_id},
-                    {"participants": participants}
-                )
-                
+            old_days = {day['day']: day for day in before.get('days', [])}
+            self._apply_participation_deltas([
+                (old_days[day_number], day_update['attendance'], day_update['roles'])
+                for day_number, day_update in day_updates.items() if day_number in old_days
+            ])
+
+            # Clear caches that might contain this ride's data
+            self.get_ride_by_id.clear()
+            self.get_upcoming_rides.clear()
+            self.get_all_rides_sorted.clear()
+            self.get_past_rides.clear()
+            return True
+        except Exception as e:
+            logging.error(f"Error updating ride days: {e}")
+            return False
+
+    def _apply_participation_deltas(self, changes: List[Tuple[Dict[str, Any], List[str], Dict[str, str]]]):
+        """
+        Adjust users' participation counters by the difference between days' old and new state
+        changes: (old_day, new_attendance, new_roles) per updated day
+        """
+        deltas: Dict[str, Dict[str, int]] = {}
+
+        def bump(user_id, field, amount):
+            if user_id:
+                fields = deltas.setdefault(str(user_id), {})
+                fields[field] = fields.get(field, 0) + amount
+
+        for old_day, attendance, roles in changes:
+            old_attendance = {str(user_id) for user_id in old_day.get('attendance', [])}
+            new_attendance = {str(user_id) for user_id in attendance}
+            for user_id in new_attendance - old_attendance:
+                bump(user_id, "participation.total_days_attended", 1)
+            for user_id in old_attendance - new_attendance:
+                bump(user_id, "participation.total_days_attended", -1)
+
+            old_roles = old_day.get('roles') or {}
+            for role in ("lead", "sweep", "pilot", "pilot2"):
+                old_holder, new_holder = old_roles.get(role), roles.get(role)
+                if old_holder != new_holder:
+                    bump(old_holder, f"participation.roles.{role}", -1)
+                    bump(new_holder, f"participation.roles.{role}", 1)
+
+        operations = []
+        for user_id, fields in deltas.items():
+            increments = {field: amount for field, amount in fields.items() if amount}
+            if increments:
+                operations.append(pymongo.UpdateOne({"_id": to_object_id(user_id)}, {"$inc": increments}))
+        if operations:
+            self.db_manager.get_collection("users").bulk_write(operations, ordered=False)
+
+    def ensure_participation_counters(self):
+        """One-time backfill of the users' participation counters from existing rides"""
+        counters = self.db_manager.get_collection("counters")
+        if counters.find_one({"_id": "participation_backfill"}):
+            return
+
+        users = self.db_manager.get_collection("users")
+        participation = self.get_participation_bulk()
+        zero = {"total_days_attended": 0, "roles": {"lead": 0, "sweep": 0, "pilot": 0, "pilot2": 0}}
+        operations = [
+            pymongo.UpdateOne(
+                {"_id": user['_id']},
+                {"$set": {"participation": participation.get(str(user['_id']), zero)}}
+            )
+            for user in users.find({}, {"_id": 1})
+        ]
+        if operations:
+            users.bulk_write(operations, ordered=False)
+
+        counters.update_one(
+            {"_id": "participation_backfill"},
+            {"$set": {"completed_at": datetime.utcnow()}},
+            upsert=True
+        )
+        logging.info(f"Backfilled participation counters for {len(operations)} users")
+
+    def watch_ride_changes(self):
+        """
+        Clear the ride caches whenever any process changes the rides collection,
+        so other app instances' edits show up before the cache TTLs expire
+        """
+        def clear_caches():
+            self.get_ride_by_id.clear()
+            self.get_upcoming_rides.clear()
+            self.get_past_rides.clear()
+            self.get_all_rides_sorted.clear()
+            self.get_ride_statistics.clear()
+
+        def watch():
+            pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+            collection = self.db_manager.get_collection(self.collection)
+            pause = threading.Event()
+            resume_token, delay = None, 1
+            while True:
+                try:
+                    with collection.watch(pipeline, resume_after=resume_token) as stream:
+                        delay = 1
+                        for _ in stream:
+                            resume_token = stream.resume_token
+                            clear_caches()
+                except pymongo.errors.OperationFailure as e:
+                    if e.code == 40573:
+                        # Change streams need a replica set; standalone servers fall back to the TTLs
+                        logging.warning(f"Ride change stream unavailable, relying on cache TTLs: {e}")
+                        return
+                    if e.code == 286:
+                        # The oplog no longer holds the resume point: start from now
+                        resume_token = None
+                    logging.warning(f"Ride change stream failed, reopening in {delay}s: {e}")
+                except pymongo.errors.PyMongoError as e:
+                    # Network errors and elections: reopen where the stream left off
+                    logging.warning(f"Ride change stream interrupted, reopening in {delay}s: {e}")
+                pause.wait(delay)
+                delay = min(delay * 2, 60)
+                # Changes made while the stream was down may not be replayed
+                clear_caches()
+
+        threading.Thread(target=watch, name="rides-watch", daemon=True).start()
+
+    def schedule_archiving(self):
+        """Run archive_old_rides now and then daily on a background thread; failures are logged"""
+        def run():
+            pause = threading.Event()
+            while True:
+                try:
+                    self.archive_old_rides()
+                except Exception as e:
+                    logging.error(f"Error archiving old rides: {e}")
+                pause.wait(24 * 60 * 60)
+
+        threading.Thread(target=run, name="rides-archive", daemon=True).start()
+
+    def archive_old_rides(self):
+        """Copy long-finished rides to rides_archive and flag them for TTL expiry; runs at most daily"""
+        counters = self.db_manager.get_collection("counters")
+        today = datetime.combine(date.today(), time())
+        if counters.find_one({"_id": "ride_archive", "last_run": {"$gte": today}}):
+            return
+
+        rides = self.db_manager.get_collection(self.collection)
+        cutoff = datetime.now() - timedelta(days=RIDE_ARCHIVE_AFTER_DAYS)
+        old_rides = list(rides.find({"end_date": {"$lt": cutoff}, "archived": {"$ne": True}}))
+        if old_rides:
+            self.db_manager.get_collection("rides_archive").bulk_write(
+                [pymongo.ReplaceOne({"_id": ride["_id"]}, ride, upsert=True) for ride in old_rides],
+                ordered=False
+            )
+            rides.update_many(
+                {"_id": {"$in": [ride["_id"] for ride in old_rides]}},
+                {"$set": {"archived": True}}
+            )
+            self.get_past_rides.clear()
+            self.get_all_rides_sorted.clear()
+
+        counters.update_one(
+            {"_id": "ride_archive"},
+            {"$set": {"last_run": datetime.now()}},
+            upsert=True
+        )
+        logging.info(f"Archived {len(old_rides)} rides")
+
+    def add_participant(self, ride_id: int, user_id: str) -> bool:
+        """Add a participant to a ride"""
+        try:
+            result = self.db_manager.update_one_raw(
+                self.collection,
+                {"ride_id": ride_id},
+                {"$addToSet": {"participants": user_id}},
+                fast=True
+            )
+            if result.modified_count:
                 # Clear caches that might contain this ride's data
                 self.get_ride_by_id.clear()
+                self.get_upcoming_rides.clear()
+                self.get_all_rides_sorted.clear()
                 
-            return True
+            return result.matched_count > 0
         except Exception as e:
             logging.error(f"Error adding participant: {e}")
             return False
@@ -403,23 +826,19 @@ class RideManager:
     def remove_participant(self, ride_id: int, user_id: str) -> bool:
         """Remove a participant from a ride"""
         try:
-            ride = self.get_ride_by_id(ride_id)
-            if not ride:
-                return False
-
-            participants = ride.get('participants', [])
-            if user_id in participants:
-                participants.remove(user_id)
-                self.db_manager.update_document(
-                    self.collection,
-                    {"ride_id": ride_id},
-                    {"participants": participants}
-                )
-                
+            result = self.db_manager.update_one_raw(
+                self.collection,
+                {"ride_id": ride_id},
+                {"$pull": {"participants": user_id}},
+                fast=True
+            )
+            if result.modified_count:
                 # Clear caches that might contain this ride's data
                 self.get_ride_by_id.clear()
+                self.get_upcoming_rides.clear()
+                self.get_all_rides_sorted.clear()
                 
-            return True
+            return result.matched_count > 0
         except Exception as e:
             logging.error(f"Error removing participant: {e}")
             return False
@@ -432,111 +851,187 @@ class RideManager:
         start_date = ride_data['start_date'].strftime('%d-%b-%Y')
         end_date = ride_data['end_date'].strftime('%d-%b-%Y')
         
-        message = f"""🏍️ *{ride_data['name']}*
-        
-📅 Date: {start_date}
-{f"➡️ End Date: {end_date}" if start_date != end_date else ""}
-⏰ Meeting Time: {ride_data['meeting_time']}
-🚦 Departure Time: {ride_data['departure_time']}
-📍 Meeting Point: {ride_data['meeting_point']}
-
-📝 Description:
-{ride_data['description']}
-
-👮‍♂️ Ride Marshal: {ride_data['ride_marshal']['name']}
-📱 Contact: {ride_data['ride_marshal']['phone']}
-
-🎫 Ride ID: #{ride_data['ride_id']}
-⏳ Duration: {days_str}
-
-Please confirm your participation by responding in the group.
-Remember to carry your gear and necessary documents.
-
-#BikeLife #RideSafe"""
-        
-        return message
+        return _WHATSAPP_TMPL(
+            name=ride_data['name'],
+            start_date=start_date,
+            end_line=f"➡️ End Date: {end_date}\n" if start_date != end_date else "",
+            meeting_time=ride_data['meeting_time'],
+            departure_time=ride_data['departure_time'],
+            meeting_point=ride_data['meeting_point'],
+            description=ride_data['description'],
+            marshal_name=ride_data['ride_marshal']['name'],
+            marshal_phone=ride_data['ride_marshal']['phone'],
+            ride_id=ride_data['ride_id'],
+            days=days_str
+        )
 
     @st.cache_data(ttl=60)  # Cache for 1 minute
     def get_ride_statistics(_self, ride_id: int) -> Dict[str, Any]:
         """Get comprehensive statistics for a ride"""
-        ride = _self.get_ride_by_id(ride_id)
-        if not ride:
+        def attendance_size(day):
+            return {"$size": {"$ifNull": [f"{day}.attendance", []]}}
+
+        # Per-day counts are computed server-side; only the numbers come back
+        pipeline = [
+            {"$match": {"ride_id": ride_id}},
+            {"$project": {
+                "_id": 0,
+                "total_participants": {"$size": {"$ifNull": ["$participants", []]}},
+                "days": {"$map": {
+                    "input": {"$ifNull": ["$days", []]},
+                    "as": "day",
+                    "in": {
+                        "day": "$$day.day",
+                        "date": "$$day.date",
+                        "attendance_count": attendance_size("$$day"),
+                        "roles": {"$ifNull": ["$$day.roles", {}]},
+                        "has_second_pilot": {"$ifNull": ["$$day.has_second_pilot", False]}
+                    }
+                }},
+                "total_attendance": {"$sum": {"$map": {
+                    "input": {"$ifNull": ["$days", []]},
+                    "as": "day",
+                    "in": attendance_size("$$day")
+                }}}
+            }}
+        ]
+        stats = next(_self.db_manager.get_collection(_self.collection).aggregate(pipeline), None)
+        if not stats:
             return {}
 
-        stats = {
-            "total_participants": len(ride.get('participants', [])),
-            "days": [],
-            "total_attendance": 0
-        }
-
-        for day in ride.get('days', []):
-            day_stats = {
-                "day": day['day'],
-                "date": day['date'],
-                "attendance_count": len(day.get('attendance', [])),
-                "roles": day.get('roles', {}),
-                "has_second_pilot": day.get('has_second_pilot', False)
-            }
-            stats["days"].append(day_stats)
-            stats["total_attendance"] += day_stats["attendance_count"]
-
         if stats["days"]:
             stats["average_attendance"] = stats["total_attendance"] / len(stats["days"])
 
         return stats
 
-    @st.cache_data(ttl=60)  # Cache for 1 minute
-    def get_user_participation(_self, user_id: str) -> Dict[str, Any]:
-        """Get participation statistics for a specific user"""
-        rides = list(_self.db_manager.get_collection(_self.collection).find({
-            "$or": [
-                {"participants": user_id},
-                {"days.attendance": user_id},
-                {"days.roles.lead": user_id},
-                {"days.roles.sweep": user_id},
-                {"days.roles.pilot": user_id},
-                {"days.roles.pilot2": user_id}  # Include second pilot role
-            ]
-        }))
-
-        stats = {
-            "total_rides_participated": 0,
-            "total_days_attended": 0,
-            "roles": {
-                "lead": 0,
-                "sweep": 0,
-                "pilot": 0,
-                "pilot2": 0  # Add second pilot count
-            },
-            "recent_rides": []
-        }
-
-        for ride in rides:
-            stats["total_rides_participated"] += 1
-            
-            for day in ride.get('days', []):
-                if user_id in day.get('attendance', []):
-                    stats["total_days_attended"] += 1
-                
-                roles = day.get('roles', {})
-                if roles.get('lead') == user_id:
-                    stats["roles"]["lead"] += 1
-                if roles.get('sweep') == user_id:
-                    stats["roles"]["sweep"] += 1
-                if roles.get('pilot') == user_id:
-                    stats["roles"]["pilot"] += 1
-                if roles.get('pilot2') == user_id:
-                    stats["roles"]["pilot2"] += 1
-
-            # Add to recent rides if within last 30 days
-            if ride['end_date'] >= datetime.utcnow() - timedelta(days=30):
-                stats["recent_rides"].append({
-                    "ride_id": ride['ride_id'],
-                    "name": ride['name'],
-                    "date": ride['start_date']
-                })
+    def get_participation_bulk(self, user_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Days attended and role counts for many users in one aggregation, keyed by user id"""
+        pipeline = []
+        if user_ids is not None:
+            # Drop rides none of the users touched before unwinding
+            pipeline.append({"$match": {"$or": [
+                {field: {"$in": user_ids}}
+                for field in ("days.attendance", "days.roles.lead", "days.roles.sweep",
+                              "days.roles.pilot", "days.roles.pilot2")
+            ]}})
+        pipeline += [
+            {"$unwind": "$days"},
+            # One (user, role) entry per attendee and role holder of each day
+            {"$project": {"_id": 0, "entries": {"$concatArrays": [
+                {"$map": {
+                    "input": {"$setUnion": [{"$ifNull": ["$days.attendance", []]}, []]},
+                    "as": "user",
+                    "in": {"user": "$$user", "role": "attended"}
+                }},
+                [{"user": f"$days.roles.{role}", "role": role}
+                 for role in ("lead", "sweep", "pilot", "pilot2")]
+            ]}}},
+            {"$unwind": "$entries"},
+            {"$match": {"entries.user": {"$in": user_ids} if user_ids is not None else {"$ne": None}}},
+            {"$group": {"_id": {"user": "$entries.user", "role": "$entries.role"}, "count": {"$sum": 1}}}
+        ]
 
-        return stats
+        participation = {}
+        for row in self.db_manager.get_collection(self.collection).aggregate(pipeline):
+            counts = participation.setdefault(row['_id']['user'], {
+                "total_days_attended": 0,
+                "roles": {"lead": 0, "sweep": 0, "pilot": 0, "pilot2": 0}
+            })
+            if row['_id']['role'] == "attended":
+                counts['total_days_attended'] = row['count']
+            else:
+                counts['roles'][row['_id']['role']] = row['count']
+        return participation
+
+
+# Role eligibility thresholds
+SWEEP_MIN_RIDES = 10
+LEAD_MIN_SWEEPS = 3
+RP_MIN_SWEEPS = 3
+RP_MIN_LEADS = 3
+
+def check_eligibility(total_rides: int, sweeps: int, leads: int) -> Tuple[bool, bool, bool]:
+    """Return (sweep_eligible, lead_eligible, rp_eligible) for the given combined stats"""
+    return (
+        total_rides >= SWEEP_MIN_RIDES,
+        sweeps >= LEAD_MIN_SWEEPS,
+        sweeps >= RP_MIN_SWEEPS and leads >= RP_MIN_LEADS
+    )
+
+# Pre-ride report card templates; only the per-rider fields are substituted
+_CARD_STYLE = "padding: 20px; border-radius: 10px; margin-bottom: 10px;"
+_LEAD_CARD_TMPL = (
+    "<div style='background-color: rgba(59, 130, 246, 0.2); " + _CARD_STYLE + "'>"
+    "<h3>{name}</h3>"
+    "<p><strong>Lead Qualification:</strong> {sweeps} sweeps (minimum 3 required)</p>"
+    "<p><strong>Phone:</strong> {phone}</p>"
+    "</div>"
+).format
+_SWEEP_CARD_TMPL = (
+    "<div style='background-color: rgba(34, 197, 94, 0.2); " + _CARD_STYLE + "'>"
+    "<h3>{name}</h3>"
+    "<p><strong>Sweep Qualification:</strong> {total_rides} rides (minimum 10 required)</p>"
+    "<p><strong>Phone:</strong> {phone}</p>"
+    "</div>"
+).format
+_RP_CARD_TMPL = (
+    "<div style='background-color: rgba(234, 179, 8, 0.2); " + _CARD_STYLE + "'>"
+    "<h3>{name}</h3>"
+    "<p><strong>RP Qualification:</strong> {sweeps} sweeps and {leads} leads (minimum 3 each required)</p>"
+    "<p><strong>Phone:</strong> {phone}</p>"
+    "</div>"
+).format
+
+# Ride cards for Available Rides and Ride History
+_RIDE_CARD_TMPL = (
+    '<div class="ride-card">'
+    "<h3>#{ride_id} - {name} {badge}</h3>"
+    "<p>📍 {meeting_point}</p>"
+    "<p>📅 {dates} | ⏰ {meeting_time}</p>"
+    "<p>{description}</p>"
+    "</div>"
+).format
+_HISTORY_CARD_TMPL = (
+    '<div class="ride-card">'
+    "<h3>#{ride_id} - {name}</h3>"
+    "<p><strong>Ride Marshal:</strong> {marshal}</p>"
+    "<p>📍 {meeting_point}</p>"
+    "<p>📅 {start_date} | ⏰ {meeting_time} - {arrival_time}</p>"
+    "<p>{description}</p>"
+    "</div>"
+).format
+_JOINED_BADGE = (
+    '<span style="background-color: #10b981; color: white; padding: 3px 8px; border-radius: 4px; '
+    'font-size: 0.8rem; font-weight: 600; float: right;">Joined ✓</span>'
+)
+
+@st.cache_data
+def _dashboard_css() -> str:
+    """Read the dashboard stylesheet once per process"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "dashboard.css")) as f:
+        return f.read()
+
+_PAGE_ICONS = {
+    "Dashboard": "📊",
+    "Create Ride": "🏍️",
+    "User Management": "👥",
+    "Attendance": "✓",
+    "Pre-ride Report": "📋",
+    "Ride History": "📜",
+    "Meeting Point Management": "📍"
+}
+_PAGE_LABELS = {page: f"{icon} {page}" for page, icon in _PAGE_ICONS.items()}
+
+def _pages_for(roles: List[str]) -> List[str]:
+    """Sidebar pages available to a user with the given roles"""
+    available_pages = ["Dashboard", "Ride History"]  # Add Ride History to all roles
+    if "flag_holder" in roles:
+        available_pages.extend(["Create Ride", "Pre-ride Report"])
+    if "admin" in roles:
+        available_pages.extend(["User Management", "Meeting Point Management"])  # Add new admin page
+    if "admin" in roles or "flag_holder" in roles:
+        available_pages.extend(["Attendance"])
+    return available_pages
 
 class Dashboard:
     def __init__(self, user_manager, ride_manager):
@@ -546,23 +1041,33 @@ class Dashboard:
     def _show_ride_history(self):
         st.markdown('<h1 class="section-header">Ride History</h1>', unsafe_allow_html=True)
         
-        past_rides = self.ride_manager.get_past_rides()
+        limit = st.session_state.setdefault("ride_history_limit", PAST_RIDES_PAGE_SIZE)
+        past_rides = self.ride_manager.get_past_rides(
+            projection=RideManager.RIDE_CARD_PROJECTION, limit=limit
+        )
         
         if not past_rides:
             st.info("No past rides found.")
             return
             
-        for ride in past_rides:
-            st.markdown(f"""
-            <div class="ride-card">
-                <h3>#{ride['ride_id']} - {ride['name']}</h3>
-                <p><strong>Ride Marshal:</strong> {ride['ride_marshal']['name']}</p>
-                <p>📍 {ride['meeting_point']}</p>
-                <p>📅 {ride['start_date'].strftime('%Y-%m-%d')} | 
-                   ⏰ {ride['meeting_time']} - {ride.get('arrival_time', 'N/A')}</p>
-                <p>{ride.get('description', '')}</p>
-            </div>
-            """, unsafe_allow_html=True)
+        # One markdown call for the whole page of cards
+        st.markdown("".join(
+            _HISTORY_CARD_TMPL(
+                ride_id=ride['ride_id'],
+                name=ride['name'],
+                marshal=ride['ride_marshal']['name'],
+                meeting_point=ride['meeting_point'],
+                start_date=ride['start_date'].strftime('%Y-%m-%d'),
+                meeting_time=ride['meeting_time'],
+                arrival_time=ride.get('arrival_time', 'N/A'),
+                description=ride.get('description', '')
+            )
+            for ride in past_rides
+        ), unsafe_allow_html=True)
+
+        if len(past_rides) == limit and st.button("Load older rides", key="ride_history_more"):
+            st.session_state.ride_history_limit = limit + PAST_RIDES_PAGE_SIZE
+            st.rerun()
 
     def _show_meeting_point_management(self):
         st.markdown('<h1 class="section-header">Meeting Point Management</h1>', unsafe_allow_html=True)
@@ -582,317 +1087,32 @@ class Dashboard:
         st.subheader("Existing Meeting Points")
         existing_points = self.ride_manager.get_meeting_points()
         
-        for point in existing_points:
-            col1, col2 = st.columns([4, 1])
-            with col1:
-                st.write(point)
-            with col2:
-                if st.button("Remove", key=f"remove_{point}"):
-                    if self.ride_manager.remove_meeting_point(point):
-                        st.success("Meeting point removed successfully!")
-                        st.rerun()
-                    else:
-                        st.error("Failed to remove meeting point")
+        if not existing_points:
+            st.info("No meeting points added yet.")
+            return
+        
+        # One list element plus a single remove control, instead of a row of widgets per point
+        st.markdown("\n".join(f"- {point}" for point in existing_points))
+        
+        col1, col2 = st.columns([4, 1], vertical_alignment="bottom")
+        with col1:
+            point_to_remove = st.selectbox("Remove a meeting point", existing_points, key="remove_point")
+        with col2:
+            if st.button("Remove", key="remove_point_button"):
+                if self.ride_manager.remove_meeting_point(point_to_remove):
+                    st.success("Meeting point removed successfully!")
+                    st.rerun()
+                else:
+                    st.error("Failed to remove meeting point")
 
     def show_dashboard(self, user):
         # Modern dark theme CSS
-        st.markdown("""
-            <style>
-            /* Reset and base styles */
-            :root {
-                --bg-primary: #1a1b1e;
-                --bg-secondary: #2c2e33;
-                --text-primary: #ffffff;
-                --text-secondary: #a0a0a0;
-                --accent: #7c3aed;
-                --accent-light: #9f67ff;
-                --accent-dark: #6d28d9;
-                --success: #10b981;
-                --error: #ef4444;
-                --warning: #f59e0b;
-                --info: #3b82f6;
-                --shadow-sm: 0 1px 2px rgba(0, 0, 0, 0.1);
-                --shadow-md: 0 4px 6px rgba(0, 0, 0, 0.1);
-                --shadow-lg: 0 10px 15px rgba(0, 0, 0, 0.1);
-                --transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            }
-
-            /* Global Streamlit modifications */
-            .stApp {
-                background-color: var(--bg-primary);
-                color: var(--text-primary);
-            }
-
-            /* Typography enhancements */
-            h1, h2, h3, h4, h5, h6 {
-                font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-                letter-spacing: -0.025em;
-            }
-
-            .section-header {
-                color: var(--accent);
-                font-size: 2rem;
-                font-weight: 700;
-                margin: 2rem 0 1.5rem;
-                padding-bottom: 0.75rem;
-                border-bottom: 2px solid var(--accent);
-                background: linear-gradient(90deg, var(--accent) 0%, transparent 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-            }
-
-            /* Card Components */
-            .stat-card {
-                background: linear-gradient(145deg, var(--bg-secondary), var(--bg-primary));
-                border-radius: 1rem;
-                padding: 1.5rem;
-                margin: 1rem 0;
-                box-shadow: var(--shadow-md);
-                border: 1px solid rgba(124, 58, 237, 0.1);
-                transition: var(--transition);
-                backdrop-filter: blur(10px);
-                position: relative;
-                overflow: hidden;
-            }
-
-            .stat-card::before {
-                content: '';
-                position: absolute;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                background: linear-gradient(45deg, transparent, rgba(124, 58, 237, 0.1));
-                opacity: 0;
-                transition: var(--transition);
-            }
-
-            .stat-card:hover {
-                transform: translateY(-4px);
-                border-color: var(--accent);
-                box-shadow: var(--shadow-lg);
-            }
-
-            .stat-card:hover::before {
-                opacity: 1;
-            }
-
-            .stat-card h3 {
-                color: var(--text-secondary);
-                font-size: 0.875rem;
-                font-weight: 500;
-                margin-bottom: 0.5rem;
-                text-transform: uppercase;
-                letter-spacing: 0.05em;
-            }
-
-            .stat-card h2 {
-                color: var(--text-primary);
-                font-size: 2rem;
-                font-weight: 700;
-                margin: 0;
-                background: linear-gradient(90deg, var(--accent) 0%, var(--accent-light) 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-            }
-
-            /* Ride Card Component */
-            .ride-card {
-                background: linear-gradient(145deg, var(--bg-secondary), var(--bg-primary));
-                border-radius: 1rem;
-                padding: 2rem;
-                margin: 1.5rem 0;
-                box-shadow: var(--shadow-md);
-                border: 1px solid rgba(124, 58, 237, 0.1);
-                transition: var(--transition);
-                position: relative;
-                overflow: hidden;
-            }
-
-            .ride-card:hover {
-                transform: translateY(-4px);
-                border-color: var(--accent);
-                box-shadow: var(--shadow-lg);
-            }
-
-            .ride-card h3 {
-                font-size: 1.5rem;
-                font-weight: 700;
-                margin-bottom: 1rem;
-                color: var(--text-primary);
-            }
-
-            .ride-card p {
-                color: var(--text-secondary);
-                margin: 0.5rem 0;
-                line-height: 1.6;
-            }
-
-            /* Form Elements */
-            .stTextInput input, 
-            .stSelectbox select, 
-            .stDateInput input,
-            .stTimeInput input {
-                background-color: var(--bg-secondary) !important;
-                color: var(--text-primary) !important;
-                border: 1px solid rgba(124, 58, 237, 0.2) !important;
-                border-radius: 0.5rem !important;
-                padding: 0.75rem 1rem !important;
-                transition: var(--transition) !important;
-            }
-
-            .stTextInput input:focus, 
-            .stSelectbox select:focus,
-            .stDateInput input:focus,
-            .stTimeInput input:focus {
-                border-color: var(--accent) !important;
-                box-shadow: 0 0 0 2px rgba(124, 58, 237, 0.2) !important;
-                outline: none !important;
-            }
-
-            /* Button Styles */
-            .stButton button {
-                background: linear-gradient(45deg, var(--accent-dark), var(--accent)) !important;
-                color: white !important;
-                border: none !important;
-                border-radius: 0.5rem !important;
-                padding: 0.75rem 1.5rem !important;
-                font-weight: 600 !important;
-                letter-spacing: 0.025em !important;
-                transition: var(--transition) !important;
-                text-transform: uppercase !important;
-                box-shadow: var(--shadow-sm) !important;
-            }
-
-            .stButton button:hover {
-                background: linear-gradient(45deg, var(--accent), var(--accent-light)) !important;
-                transform: translateY(-2px) !important;
-                box-shadow: var(--shadow-md) !important;
-            }
-
-            /* Alert/Message Styles */
-            .stSuccess, .stInfo, .stWarning, .stError {
-                padding: 1rem !important;
-                border-radius: 0.5rem !important;
-                margin: 1rem 0 !important;
-                animation: slideIn 0.3s ease-out;
-            }
-
-            .stSuccess {
-                background-color: rgba(16, 185, 129, 0.1) !important;
-                border: 1px solid var(--success) !important;
-            }
-
-            .stError {
-                background-color: rgba(239, 68, 68, 0.1) !important;
-                border: 1px solid var(--error) !important;
-            }
-
-            /* Sidebar Enhancements */
-            .css-1d391kg {
-                background-color: var(--bg-secondary) !important;
-            }
-
-            /* Animations */
-            @keyframes slideIn {
-                from {
-                    transform: translateY(-10px);
-                    opacity: 0;
-                }
-                to {
-                    transform: translateY(0);
-                    opacity: 1;
-                }
-            }
-
-            /* Responsive Design */
-            @media (max-width: 768px) {
-                .section-header {
-                    font-size: 1.5rem;
-                }
-                
-                .stat-card {
-                    padding: 1rem;
-                }
-                
-                .stat-card h2 {
-                    font-size: 1.5rem;
-                }
-                
-                .ride-card {
-                    padding: 1.5rem;
-                }
-                
-                .ride-card h3 {
-                    font-size: 1.25rem;
-                }
-            }
-
-            /* Custom Scrollbar */
-            ::-webkit-scrollbar {
-                width: 8px;
-                height: 8px;
-            }
-
-            ::-webkit-scrollbar-track {
-                background: var(--bg-primary);
-            }
-
-            ::-webkit-scrollbar-thumb {
-                background: var(--accent);
-                border-radius: 4px;
-            }
-
-            ::-webkit-scrollbar-thumb:hover {
-                background: var(--accent-light);
-            }
-            
-            /* Eligibility Badges */
-            .eligibility-badge {
-                display: inline-block;
-                padding: 4px 8px;
-                margin-right: 8px;
-                border-radius: 4px;
-                font-size: 0.8rem;
-                font-weight: 600;
-            }
-            
-            .eligible {
-                background-color: rgba(16, 185, 129, 0.2);
-                color: #10b981;
-                border: 1px solid #10b981;
-            }
-            
-            .not-eligible {
-                background-color: rgba(239, 68, 68, 0.2);
-                color: #ef4444;
-                border: 1px solid #ef4444;
-            }
-            </style>
-        """, unsafe_allow_html=True)
-
-        available_pages = ["Dashboard", "Ride History"]  # Add Ride History to all roles
-        if "flag_holder" in user['roles']:
-            available_pages.extend(["Create Ride", "Pre-ride Report"])
-        if "admin" in user['roles']:
-            available_pages.extend(["User Management", "Meeting Point Management"])  # Add new admin page
-        if "admin" in user['roles'] or "flag_holder" in user['roles']:
-            available_pages.extend(["Attendance"])
-
-        icons = {
-            "Dashboard": "📊",
-            "Create Ride": "🏍️",
-            "User Management": "👥",
-            "Attendance": "✓",
-            "Pre-ride Report": "📋",
-            "Ride History": "📜",
-            "Meeting Point Management": "📍"
-        }
+        st.markdown(f"<style>{_dashboard_css()}</style>", unsafe_allow_html=True)
 
         selected_page = st.sidebar.radio(
             "",
-            available_pages,
-            format_func=lambda x: f"{icons.get(x, '')} {x}"
+            _pages_for(user['roles']),
+            format_func=_PAGE_LABELS.get
         )
 
         if selected_page == "Dashboard":
@@ -911,22 +1131,23 @@ class Dashboard:
             self._show_meeting_point_management()
 
     @st.cache_data(ttl=60)  # Cache for 1 minute
-    def _calculate_total_rides(_self, _user_id):
+    def _get_rider_counters(_self, user_id: str) -> Dict[str, Any]:
+        """A user's participation counters and imported ride total, read fresh from the database"""
+        return _self.user_manager.db_manager.find_document(
+            "users",
+            {"_id": to_object_id(user_id)},
+            projection={"is_existing_user": 1, "stats.total_rides": 1, "participation": 1}
+        ) or {}
+
+    @staticmethod
+    def _total_rides_of(user: Dict) -> int:
         """
-        Calculate total rides by:
+        Calculate total rides from a user document carrying stats, participation and is_existing_user:
         1. For non-existing users: Only count current system participation
         2. For existing users: Add previous system rides to current participation
         """
-        # Convert ObjectId to string if it's not already a string
-        user_id_str = str(_user_id)
-        user_id = _user_id  # Keep original for MongoDB query
-        
-        # Get user details
-        user = _self.user_manager.db_manager.find_document("users", {"_id": user_id})
-        
-        # Get current system participation
-        participation_stats = _self.ride_manager.get_user_participation(user_id_str)
-        current_rides = participation_stats.get('total_days_attended', 0)
+        # Get current system participation from the user's counters
+        current_rides = UserManager.participation_of(user)['total_days_attended']
         
         # If user is from previous system, add their previous rides
         if user.get('is_existing_user', False):
@@ -940,32 +1161,8 @@ class Dashboard:
 
     def _show_rider_stats(self, user):
         """Show rider statistics including previous and current rides"""
-        total_rides = self._calculate_total_rides(user['_id'])
-        
-        # Get current participation stats
-        participation = self.ride_manager.get_user_participation(str(user['_id']))
-        
-        # Get previous stats
-        stats = user.get('stats', {})
-        
-        # For existing users, only add current participation to previous stats
-        # For new users, just show current participation
-        if user.get('is_existing_user', False):
-            combined_stats = {
-                'total_rides': total_rides,  # This now correctly includes both previous and current rides
-                'leads': stats.get('leads', 0) + participation['roles']['lead'],
-                'sweeps': stats.get('sweeps', 0) + participation['roles']['sweep'],
-                'running_pilots': stats.get('running_pilots', 0) + participation['roles']['pilot'] + participation['roles']['pilot2'],
-                'ride_marshals': stats.get('ride_marshals', 0)
-            }
-        else:
-            combined_stats = {
-                'total_rides': participation['total_days_attended'],
-                'leads': participation['roles']['lead'],
-                'sweeps': participation['roles']['sweep'],
-                'running_pilots': participation['roles']['pilot'] + participation['roles']['pilot2'],
-                'ride_marshals': 0
-            }
+        # The session's user document may be stale; both figures come from one cached read
+        combined_stats = self._combined_stats_of(user, self._get_rider_counters(str(user['_id'])))
         
         col1, col2, col3, col4, col5 = st.columns(5)
         stats_data = [
@@ -977,13 +1174,7 @@ class Dashboard:
         ]
         
         for col, (label, value) in zip([col1, col2, col3, col4, col5], stats_data):
-            with col:
-                st.markdown(f"""
-                <div class="stat-card">
-                    <h3>{label}</h3>
-                    <h2>{value}</h2>
-                </div>
-                """, unsafe_allow_html=True)
+            col.metric(label, value)
 
     def _show_main_dashboard(self, user):
         st.markdown('<h1 class="section-header">🏍️ Dashboard</h1>', unsafe_allow_html=True)
@@ -998,7 +1189,10 @@ class Dashboard:
             col1, col2 = st.columns(2)
             with col1:
                 name = st.text_input("Ride Name")
-                meeting_point = st.selectbox("Meeting Point", self.ride_manager.MEETING_POINTS)
+                meeting_point = st.selectbox(
+                    "Meeting Point",
+                    self.ride_manager.get_meeting_points() or self.ride_manager.MEETING_POINTS
+                )
                 start_date = st.date_input("Start Date")
                 end_date = st.date_input("End Date")
             
@@ -1012,6 +1206,10 @@ class Dashboard:
             if st.form_submit_button("Create Ride"):
                 if not all([name, meeting_point, start_date, end_date, description]):
                     st.error("All fields are required!")
+                elif end_date < start_date:
+                    st.error("End date cannot be before the start date!")
+                elif departure_time < meeting_time:
+                    st.error("Departure time cannot be before the meeting time!")
                 else:
                     try:
                         ride_id, whatsapp_msg = self.ride_manager.create_ride(
@@ -1023,7 +1221,7 @@ class Dashboard:
                             start_date=datetime.combine(start_date, time()),
                             end_date=datetime.combine(end_date, time()),
                             description=description,
-                            creator_id=str(user['_id'])
+                            creator=user
                         )
                         st.success("Ride created successfully!")
                         
@@ -1042,203 +1240,175 @@ class Dashboard:
             st.info("No upcoming rides available to join.")
             return
             
+        str_user_id = str(user['_id'])
         for ride in upcoming_rides:
-            # Format dates for display
-            start_date = ride['start_date'].strftime('%Y-%m-%d')
-            end_date = ride['end_date'].strftime('%Y-%m-%d')
-            date_display = start_date if start_date == end_date else f"{start_date} to {end_date}"
-            
-            # Check if user is a participant
-            str_user_id = str(user['_id'])
-            is_registered = str_user_id in [str(p) for p in ride.get('participants', [])]
-            
-            # Add status badge to the ride card
-            status_badge = ""
+            self._show_ride_card(ride, str_user_id)
+
+    @st.fragment
+    def _show_ride_card(self, ride: Dict[str, Any], str_user_id: str):
+        """One joinable ride; Join/Leave reruns only this card"""
+        # Format dates for display
+        start_date = ride['start_date_str']
+        end_date = ride['end_date_str']
+        date_display = start_date if start_date == end_date else f"{start_date} to {end_date}"
+        
+        # Check if user is a participant (participants are stored as id strings)
+        is_registered = str_user_id in ride.get('participants', [])
+        
+        st.markdown(_RIDE_CARD_TMPL(
+            ride_id=ride['ride_id'],
+            name=ride['name'],
+            badge=_JOINED_BADGE if is_registered else "",
+            meeting_point=ride['meeting_point'],
+            dates=date_display,
+            meeting_time=ride['meeting_time'],
+            description=ride.get('description', '')
+        ), unsafe_allow_html=True)
+        
+        col1, col2 = st.columns([1, 4])
+        with col1:
             if is_registered:
-                status_badge = """<span style="background-color: #10b981; color: white; padding: 3px 8px; border-radius: 4px; font-size: 0.8rem; font-weight: 600; float: right;">Joined ✓</span>"""
-            
-            st.markdown(f"""
-            <div class="ride-card">
-                <h3>#{ride['ride_id']} - {ride['name']} {status_badge}</h3>
-                <p>📍 {ride['meeting_point']}</p>
-                <p>📅 {date_display} | ⏰ {ride['meeting_time']}</p>
-                <p>{ride.get('description', '')}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns([1, 4])
-            with col1:
-                if is_registered:
-                    if st.button("Leave", key=f"leave_{ride['ride_id']}", type="primary"):
-                        if self.ride_manager.remove_participant(ride['ride_id'], str_user_id):
-                            st.success("You have left this ride.")
-                            st.rerun()
-                else:
-                    if st.button("Join", key=f"join_{ride['ride_id']}", type="primary"):
-                        if self.ride_manager.add_participant(ride['ride_id'], str_user_id):
-                            st.success("You have joined this ride!")
-                            st.rerun()
+                if st.button("Leave", key=f"leave_{ride['ride_id']}", type="primary"):
+                    if self.ride_manager.remove_participant(ride['ride_id'], str_user_id):
+                        self._refresh_rider_caches()
+                        # A fragment rerun gets this same ride dict back; keep it in step with the write
+                        ride['participants'] = [p for p in ride.get('participants', []) if p != str_user_id]
+                        st.toast("You have left this ride.")
+                        st.rerun(scope="fragment")
+            else:
+                if st.button("Join", key=f"join_{ride['ride_id']}", type="primary"):
+                    if self.ride_manager.add_participant(ride['ride_id'], str_user_id):
+                        self._refresh_rider_caches()
+                        ride['participants'] = ride.get('participants', []) + [str_user_id]
+                        st.toast("You have joined this ride!")
+                        st.rerun(scope="fragment")
 
     def _show_attendance_marking(self):
         st.markdown('<h1 class="section-header">Mark Attendance</h1>', unsafe_allow_html=True)
         
         # Get rides sorted by date
-        rides = self.ride_manager.get_upcoming_rides()
-        past_rides = self.ride_manager.get_past_rides()
-        all_rides = rides + past_rides
+        all_rides = self.ride_manager.get_all_rides_sorted()
         
         if not all_rides:
             st.info("No rides found.")
             return
+        
+        # The listed rides carry their participants; every ride's riders come from one $in query
+        riders = self.user_manager.get_riders_by_ids(tuple(sorted({
+            user_id for ride in all_rides for user_id in ride.get('participants', [])
+        })))
             
         for ride in all_rides:
-            ride_dates = f"{ride['start_date'].strftime('%Y-%m-%d')} to {ride['end_date'].strftime('%Y-%m-%d')}"
+            ride_dates = f"{ride['start_date_str']} to {ride['end_date_str']}"
             with st.expander(f"#{ride['ride_id']} - {ride['name']} ({ride_dates})"):
                 # Get only the registered users for this ride
-                registered_users = self.user_manager.get_registered_users_for_ride(ride['ride_id'])
+                registered_users = [riders[user_id] for user_id in ride.get('participants', []) if user_id in riders]
                 
                 # If no registered users, show a message and continue to next ride
                 if not registered_users:
                     st.warning("No users registered for this ride. Users must join the ride before attendance can be marked.")
                     continue
                 
-                # Show attendance for each day
-                for day in ride['days']:
-                    st.subheader(f"Day {day['day']} - {day['date'].strftime('%Y-%m-%d')}")
-                    
-                    # Current attendance and roles
-                    current_attendance = day.get('attendance', [])
-                    current_roles = day.get('roles', {})
-                    
-                    # Convert all IDs to strings for consistent comparison
-                    current_attendance = [str(id) for id in current_attendance]
-                    
-                    # Create list of registered user IDs (as strings)
-                    registered_user_ids = [str(user['_id']) for user in registered_users]
-                    
-                    # Filter default values to ensure they're in the options
-                    valid_defaults = [user_id for user_id in current_attendance if user_id in registered_user_ids]
-                    
-                    selected_users = st.multiselect(
-                        f"Select present riders for Day {day['day']}",
-                        options=registered_user_ids,
-                        default=valid_defaults,
-                        format_func=lambda x: next(
-                            (user['name'] for user in registered_users if str(user['_id']) == x),
-                            str(x)
-                        ),
-                        key=f"attendance_{ride['ride_id']}_{day['day']}"
-                    )
-                    
-                    # Get eligibility status for registered users only
-                    eligibility_map = {}
-                    for user in registered_users:
-                        # Convert ObjectId to string before passing to _get_eligibility_status
-                        user_id_str = str(user['_id'])
-                        eligibility_map[user_id_str] = self._get_eligibility_status(user['_id'])
-                    
-                    # Add eligibility info to the roles section
-                    st.markdown("### Role Assignment")
-                    
-                    # Option for second running pilot
-                    has_second_pilot = st.checkbox(
-                        "Include a second Running Pilot for this day", 
-                        value=day.get('has_second_pilot', False),
-                        key=f"second_pilot_option_{ride['ride_id']}_{day['day']}"
-                    )
-                    
-                    # Roles selection
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        # Display eligible status with each role selection
-                        st.markdown("#### Lead Rider")
-                        for user in registered_users:
-                            user_id = str(user['_id'])
-                            is_eligible = eligibility_map[user_id]['lead_eligible']
-                            badge_class = "eligible" if is_eligible else "not-eligible"
-                            st.markdown(f"""
-                            <span class="eligibility-badge {badge_class}">
-                                {user['name']} - {"✓ Eligible" if is_eligible else "✗ Not Eligible"}
-                            </span>
-                            """, unsafe_allow_html=True)
+                # Per-ride lookups shared by every day's widgets
+                registered_user_ids = [user['id_str'] for user in registered_users]
+                name_by_id = {user_id: user['name'] for user_id, user in zip(registered_user_ids, registered_users)}
+                # Role selects lead with an explicit unset option, so an untouched day never
+                # assigns a role nobody picked
+                role_options = [None] + registered_user_ids
+                role_index_by_id = {user_id: i for i, user_id in enumerate(role_options)}
+                role_label = lambda user_id: "Not assigned" if user_id is None else name_by_id[user_id]
+                eligibility_map = {
+                    user_id: self._eligibility_of(user)
+                    for user_id, user in zip(registered_user_ids, registered_users)
+                }
+                
+                # Selections are held client-side until a submit, so picking riders does not rerun the page
+                with st.form(f"attendance_form_{ride['ride_id']}", border=False):
+                    # Show attendance for each day, collecting the days whose selections changed
+                    day_updates = {}
+                    for day in ride['days']:
+                        st.subheader(f"Day {day['day']} - {day['date'].strftime('%Y-%m-%d')}")
                         
-                        # Determine default selection for Lead
-                        lead_default_index = 0
-                        if current_roles.get('lead') in registered_user_ids:
-                            lead_default_index = registered_user_ids.index(current_roles.get('lead'))
-                            
-                        lead = st.selectbox(
-                            "Select Lead Rider",
+                        # Current attendance and roles
+                        current_attendance = day.get('attendance', [])
+                        current_roles = day.get('roles', {})
+                        
+                        # Convert all IDs to strings for consistent comparison
+                        current_attendance = [str(id) for id in current_attendance]
+                        
+                        # Filter default values to ensure they're in the options
+                        valid_defaults = [user_id for user_id in current_attendance if user_id in name_by_id]
+                        
+                        selected_users = st.multiselect(
+                            f"Select present riders for Day {day['day']}",
                             options=registered_user_ids,
-                            index=lead_default_index if registered_user_ids else None,
-                            format_func=lambda x: next(
-                                (user['name'] for user in registered_users if str(user['_id']) == x),
-                                str(x)
-                            ),
-                            key=f"lead_{ride['ride_id']}_{day['day']}"
+                            default=valid_defaults,
+                            format_func=name_by_id.get,
+                            key=f"attendance_{ride['ride_id']}_{day['day']}"
                         )
                         
-                        st.markdown("#### Sweep Rider")
-                        for user in registered_users:
-                            user_id = str(user['_id'])
-                            is_eligible = eligibility_map[user_id]['sweep_eligible']
-                            badge_class = "eligible" if is_eligible else "not-eligible"
-                            st.markdown(f"""
-                            <span class="eligibility-badge {badge_class}">
-                                {user['name']} - {"✓ Eligible" if is_eligible else "✗ Not Eligible"}
-                            </span>
-                            """, unsafe_allow_html=True)
+                        # Add eligibility info to the roles section
+                        st.markdown("### Role Assignment")
                         
-                        # Determine default selection for Sweep
-                        sweep_default_index = 0
-                        if current_roles.get('sweep') in registered_user_ids:
-                            sweep_default_index = registered_user_ids.index(current_roles.get('sweep'))
-                            
-                        sweep = st.selectbox(
-                            "Select Sweep Rider",
-                            options=registered_user_ids,
-                            index=sweep_default_index if registered_user_ids else None,
-                            format_func=lambda x: next(
-                                (user['name'] for user in registered_users if str(user['_id']) == x),
-                                str(x)
-                            ),
-                            key=f"sweep_{ride['ride_id']}_{day['day']}"
+                        # Option for second running pilot
+                        has_second_pilot = st.checkbox(
+                            "Include a second Running Pilot for this day", 
+                            value=day.get('has_second_pilot', False),
+                            key=f"second_pilot_option_{ride['ride_id']}_{day['day']}"
                         )
-                    
-                    with col2:
-                        st.markdown("#### Running Pilot")
-                        for user in registered_users:
-                            user_id = str(user['_id'])
-                            is_eligible = eligibility_map[user_id]['rp_eligible']
-                            badge_class = "eligible" if is_eligible else "not-eligible"
-                            st.markdown(f"""
-                            <span class="eligibility-badge {badge_class}">
-                                {user['name']} - {"✓ Eligible" if is_eligible else "✗ Not Eligible"}
-                            </span>
-                            """, unsafe_allow_html=True)
                         
-                        # Determine default selection for Pilot
-                        pilot_default_index = 0
-                        if current_roles.get('pilot') in registered_user_ids:
-                            pilot_default_index = registered_user_ids.index(current_roles.get('pilot'))
+                        # Each role defaults to its stored holder, or to "Not assigned"
+                        role_defaults = {
+                            role: role_index_by_id.get(current_roles.get(role), 0)
+                            for role in ("lead", "sweep", "pilot", "pilot2")
+                        }
+                        
+                        # Roles selection
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            # Display eligible status with each role selection
+                            st.markdown("#### Lead Rider")
+                            for user in registered_users:
+                                user_id = user['id_str']
+                                is_eligible = eligibility_map[user_id]['lead_eligible']
+                                badge_class = "eligible" if is_eligible else "not-eligible"
+                                st.markdown(f"""
+                                <span class="eligibility-badge {badge_class}">
+                                    {user['name']} - {"✓ Eligible" if is_eligible else "✗ Not Eligible"}
+                                </span>
+                                """, unsafe_allow_html=True)
                             
-                        pilot = st.selectbox(
-                            "Select Running Pilot",
-                            options=registered_user_ids,
-                            index=pilot_default_index if registered_user_ids else None,
-                            format_func=lambda x: next(
-                                (user['name'] for user in registered_users if str(user['_id']) == x),
-                                str(x)
-                            ),
-                            key=f"pilot_{ride['ride_id']}_{day['day']}"
-                        )
+                            lead = st.selectbox(
+                                "Select Lead Rider",
+                                options=role_options,
+                                index=role_defaults['lead'],
+                                format_func=role_label,
+                                key=f"lead_{ride['ride_id']}_{day['day']}"
+                            )
+                            
+                            st.markdown("#### Sweep Rider")
+                            for user in registered_users:
+                                user_id = user['id_str']
+                                is_eligible = eligibility_map[user_id]['sweep_eligible']
+                                badge_class = "eligible" if is_eligible else "not-eligible"
+                                st.markdown(f"""
+                                <span class="eligibility-badge {badge_class}">
+                                    {user['name']} - {"✓ Eligible" if is_eligible else "✗ Not Eligible"}
+                                </span>
+                                """, unsafe_allow_html=True)
+                            
+                            sweep = st.selectbox(
+                                "Select Sweep Rider",
+                                options=role_options,
+                                index=role_defaults['sweep'],
+                                format_func=role_label,
+                                key=f"sweep_{ride['ride_id']}_{day['day']}"
+                            )
                         
-                        # Second running pilot if enabled
-                        pilot2 = None
-                        if has_second_pilot:
-                            st.markdown("#### Second Running Pilot")
+                        with col2:
+                            st.markdown("#### Running Pilot")
                             for user in registered_users:
-                                user_id = str(user['_id'])
+                                user_id = user['id_str']
                                 is_eligible = eligibility_map[user_id]['rp_eligible']
                                 badge_class = "eligible" if is_eligible else "not-eligible"
                                 st.markdown(f"""
@@ -1247,40 +1417,71 @@ class Dashboard:
                                 </span>
                                 """, unsafe_allow_html=True)
                             
-                            # Determine default selection for Pilot2
-                            pilot2_default_index = 0
-                            if current_roles.get('pilot2') in registered_user_ids:
-                                pilot2_default_index = registered_user_ids.index(current_roles.get('pilot2'))
-                                
+                            pilot = st.selectbox(
+                                "Select Running Pilot",
+                                options=role_options,
+                                index=role_defaults['pilot'],
+                                format_func=role_label,
+                                key=f"pilot_{ride['ride_id']}_{day['day']}"
+                            )
+                            
+                            # A form cannot reveal a widget when the checkbox is ticked, so the
+                            # second pilot select is always shown and only used when included
                             pilot2 = st.selectbox(
-                                "Select Second Running Pilot",
-                                options=registered_user_ids,
-                                index=pilot2_default_index if registered_user_ids else None,
-                                format_func=lambda x: next(
-                                    (user['name'] for user in registered_users if str(user['_id']) == x),
-                                    str(x)
-                                ),
+                                "Select Second Running Pilot (if included)",
+                                options=role_options,
+                                index=role_defaults['pilot2'],
+                                format_func=role_label,
                                 key=f"pilot2_{ride['ride_id']}_{day['day']}"
                             )
-                    
-                    if st.button(f"Update Day {day['day']}", key=f"update_day_{ride['ride_id']}_{day['day']}"):
+                        
                         roles = {
                             "lead": lead,
                             "sweep": sweep,
                             "pilot": pilot,
                             "pilot2": pilot2 if has_second_pilot else None
                         }
-                        if self.ride_manager.update_ride_day(ride['ride_id'], day['day'], selected_users, roles, has_second_pilot):
-                            st.success(f"Day {day['day']} updated successfully!")
+                        shown_second_pilot = day.get('has_second_pilot', False)
+                        shown_roles = {role: role_options[index] for role, index in role_defaults.items()}
+                        if not shown_second_pilot:
+                            shown_roles['pilot2'] = None
+                        if (set(selected_users) != set(valid_defaults) or roles != shown_roles
+                                or has_second_pilot != shown_second_pilot):
+                            day_updates[day['day']] = {
+                                "attendance": selected_users,
+                                "roles": roles,
+                                "has_second_pilot": has_second_pilot
+                            }
+                        
+                        if st.form_submit_button(f"Update Day {day['day']}"):
+                            if self.ride_manager.update_ride_day(ride['ride_id'], day['day'], selected_users, roles, has_second_pilot):
+                                self._refresh_rider_caches()
+                                st.success(f"Day {day['day']} updated successfully!")
+                                st.rerun()
+                            else:
+                                st.error("Failed to update attendance and roles")
+                    
+                    # Multi-day rides can be saved in one go; untouched days are left as stored
+                    if len(ride['days']) > 1 and st.form_submit_button("Save all days", type="primary"):
+                        if not day_updates:
+                            st.info("No changes to save.")
+                        elif self.ride_manager.update_ride_days(ride['ride_id'], day_updates):
+                            self._refresh_rider_caches()
+                            st.success("All days updated successfully!")
                             st.rerun()
                         else:
                             st.error("Failed to update attendance and roles")
+
+    def _refresh_rider_caches(self):
+        """Riders or their counters changed: drop cached rider lists, stats and eligibility"""
+        self.user_manager.get_registered_users_for_ride.clear()
+        self.user_manager.get_riders_by_ids.clear()
+        self._get_rider_counters.clear()
+        self._compute_eligibility.clear()
                                 
     def _show_user_management(self):
       st.markdown('<h1 class="section-header">User Management</h1>', unsafe_allow_html=True)
       
-      users = self.user_manager.get_all_users()
-      
       # Filter controls
       col1, col2 = st.columns(2)
       with col1:
@@ -1296,79 +1497,157 @@ class Dashboard:
               key="role_filter"
           )
       
-      for user in users:
-          # Apply filters
-          if status_filter != "All" and user.get('status', 'Active') != status_filter:
-              continue
-          if role_filter != "All" and role_filter.lower().replace(" ", "_") not in user.get('roles', []):
-              continue
-
-          with st.expander(f"{user['name']} ({user['email']})"):
+      users = self.user_manager.get_all_users(
+          status=None if status_filter == "All" else status_filter,
+          role=None if role_filter == "All" else role_filter.lower().replace(" ", "_"),
+          projection=UserManager.ADMIN_PROJECTION
+      )
+      
+      # Admin changes are queued per user and written together in one bulk write
+      pending = st.session_state.setdefault("pending_user_updates", {})
+      if pending:
+          col1, col2 = st.columns([1, 4])
+          with col1:
+              if st.button(f"Apply {len(pending)} change(s)", key="apply_user_updates", type="primary"):
+                  if self.user_manager.bulk_update_users(pending):
+                      st.session_state.pending_user_updates = {}
+                      st.success("User changes saved")
+                      st.rerun()
+                  else:
+                      st.error("Failed to save user changes")
+          with col2:
+              if st.button("Discard changes", key="discard_user_updates"):
+                  st.session_state.pending_user_updates = {}
+                  st.rerun()
+      
+      # Only one page of expanders is built per rerun, however many users match
+      page_count = max(1, -(-len(users) // USERS_PAGE_SIZE))
+      if page_count > 1:
+          # A narrower filter can leave the remembered page past the end
+          if st.session_state.get("user_page", 1) > page_count:
+              st.session_state.user_page = page_count
+          page = st.number_input(
+              f"Page (of {page_count}, {len(users)} users)",
+              min_value=1, max_value=page_count, step=1,
+              key="user_page"
+          )
+      else:
+          page = 1
+      start = (page - 1) * USERS_PAGE_SIZE
+      
+      for user in users[start:start + USERS_PAGE_SIZE]:
+          # Show the user as it will be once queued changes are applied
+          user_id = str(user['_id'])
+          changes = pending.get(user_id, {})
+          roles = changes.get('roles', user.get('roles', []))
+          current_status = changes.get('status', user.get('status', 'Active'))
+
+          with st.expander(f"{user['name']} ({user['email']}){' • pending' if changes else ''}"):
               col1, col2 = st.columns(2)
               
               with col1:
                   st.write(f"📱 Phone: {user['phone']}")
                   st.write(f"🚨 Emergency Contact: {user['emergency_contact']}")
-                  st.write(f"🎭 Roles: {', '.join(user['roles'])}")
+                  st.write(f"🎭 Roles: {', '.join(roles)}")
                   st.write(f"📅 Joined: {user['created_at'].strftime('%Y-%m-%d')}")
               
               with col2:
                   # Role management buttons
-                  if "admin" not in user['roles']:
-                      if st.button("Make Admin", key=f"admin_{user['_id']}"):
-                          roles = user.get('roles', []) + ['admin']
-                          if self.user_manager.update_user_roles(str(user['_id']), roles):
-                              st.success("User promoted to Admin")
-                              st.rerun()
-
-                  if "flag_holder" not in user['roles']:
-                      if st.button("Make Flag Holder", key=f"fh_{user['_id']}"):
-                          roles = user.get('roles', []) + ['flag_holder']
-                          if self.user_manager.update_user_roles(str(user['_id']), roles):
-                              st.success("User promoted to Flag Holder")
-                              st.rerun()
+                  if "admin" not in roles:
+                      if st.button("Make Admin", key=f"admin_{user_id}"):
+                          pending.setdefault(user_id, {})['roles'] = roles + ['admin']
+                          st.rerun()
+
+                  if "flag_holder" not in roles:
+                      if st.button("Make Flag Holder", key=f"fh_{user_id}"):
+                          pending.setdefault(user_id, {})['roles'] = roles + ['flag_holder']
+                          st.rerun()
 
                   # Status toggle
-                  current_status = user.get('status', 'Active')
                   if st.button(
                       "Block User" if current_status == 'Active' else "Unblock User",
-                      key=f"status_{user['_id']}"
+                      key=f"status_{user_id}"
                   ):
-                      new_status = 'Blocked' if current_status == 'Active' else 'Active'
-                      if self.user_manager.update_user_status(str(user['_id']), new_status):
-                          st.success(f"User {new_status.lower()}")
-                          st.rerun()
+                      pending.setdefault(user_id, {})['status'] = 'Blocked' if current_status == 'Active' else 'Active'
+                      st.rerun()
 
-    @st.cache_data(ttl=60)  # Cache for 1 minute
-    def _get_eligibility_status(_self, _user_id):
-        """Determine rider eligibility based on combined previous and current stats"""
-        # Convert ObjectId to string if it's not already a string
-        user_id_str = str(_user_id)
-        user_id = _user_id  # Keep original for MongoDB query
+    @staticmethod
+    def _combined_stats_of(user: Dict, counters: Optional[Dict] = None,
+                           existing_only: bool = True) -> Dict[str, int]:
+        """
+        Previous plus current stats of a user. Counters carry the participation and
+        default to the user document itself. With existing_only, previous stats count
+        only for existing users (the stat tiles); eligibility always counts them.
+        """
+        counters = counters or user
+        participation = UserManager.participation_of(counters)
+        if existing_only and not user.get('is_existing_user', False):
+            stats = {}
+        else:
+            stats = user.get('stats', {})
+        return {
+            'total_rides': Dashboard._total_rides_of(counters),
+            'leads': stats.get('leads', 0) + participation['roles']['lead'],
+            'sweeps': stats.get('sweeps', 0) + participation['roles']['sweep'],
+            'running_pilots': stats.get('running_pilots', 0) + participation['roles']['pilot'] + participation['roles']['pilot2'],
+            'ride_marshals': stats.get('ride_marshals', 0)
+        }
+
+    @staticmethod
+    def _eligibility_of(user: Dict) -> Dict[str, Any]:
+        """Eligibility from a user document carrying stats, participation and is_existing_user"""
+        stats = Dashboard._combined_stats_of(user, existing_only=False)
+        sweep_eligible, lead_eligible, rp_eligible = check_eligibility(
+            stats['total_rides'], stats['sweeps'], stats['leads']
+        )
+        return {
+            'sweep_eligible': sweep_eligible,
+            'lead_eligible': lead_eligible,
+            'rp_eligible': rp_eligible,
+            'stats': stats
+        }
         
-        user = _self.user_manager.db_manager.find_document("users", {"_id": user_id})
-        stats = user.get('stats', {})
+    @st.cache_data(ttl=60, show_spinner=False)  # Cache for 1 minute
+    def _compute_eligibility(_self, ride_id: int) -> Dict[str, Any]:
+        """
+        Build the eligibility table for a ride's registered users, sorted highest first,
+        together with the per-role lists shown in the report
+        """
+        eligibility_data = []
+        for user in _self.user_manager.get_registered_users_for_ride(ride_id):
+            # Registered users are fetched with their counters, so no per-user lookup
+            eligibility = _self._eligibility_of(user)
+            eligibility_score = (4 if eligibility['rp_eligible'] else 0) + \
+                            (2 if eligibility['lead_eligible'] else 0) + \
+                            (1 if eligibility['sweep_eligible'] else 0)
+            
+            eligibility_data.append({
+                'user': user,
+                'eligibility': eligibility,
+                'score': eligibility_score
+            })
         
-        # Get current participation
-        participation = _self.ride_manager.get_user_participation(user_id_str)
+        # Sort by eligibility score (descending)
+        eligibility_data.sort(key=lambda x: x['score'], reverse=True)
         
-        # Combine previous and current stats
-        total_rides = _self._calculate_total_rides(user_id)
-        total_sweeps = stats.get('sweeps', 0) + participation['roles']['sweep']
-        total_leads = stats.get('leads', 0) + participation['roles']['lead']
+        # Bucket riders by role once so reruns only read the cached result
+        lead_eligible, sweep_eligible, rp_eligible = [], [], []
+        for item in eligibility_data:
+            eligibility = item['eligibility']
+            if eligibility['sweep_eligible']:
+                sweep_eligible.append(item)
+            if eligibility['lead_eligible']:
+                lead_eligible.append(item)
+            if eligibility['rp_eligible']:
+                rp_eligible.append(item)
         
         return {
-            'sweep_eligible': total_rides >= 10,
-            'lead_eligible': total_sweeps >= 3,
-            'rp_eligible': total_sweeps >= 3 and total_leads >= 3,
-            'stats': {
-                'total_rides': total_rides,
-                'sweeps': total_sweeps,
-                'leads': total_leads,
-                'running_pilots': stats.get('running_pilots', 0) + participation['roles']['pilot'] + participation['roles']['pilot2']
-            }
+            'riders': eligibility_data,
+            'lead_eligible': lead_eligible,
+            'sweep_eligible': sweep_eligible,
+            'rp_eligible': rp_eligible
         }
-        
+
     def _show_preride_report(self):
         """Display pre-ride report with user eligibility based on combined stats"""
         st.markdown('<h1 class="section-header">Pre-ride Report</h1>', unsafe_allow_html=True)
@@ -1394,23 +1673,26 @@ class Dashboard:
             return
             
         # Let user select a specific ride
-        ride_options = [(f"#{ride['ride_id']} - {ride['name']} ({ride['start_date'].strftime('%Y-%m-%d')})", ride['ride_id']) 
-                    for ride in upcoming_rides]
+        rides_by_id = {ride['ride_id']: ride for ride in upcoming_rides}
+        ride_labels = {
+            ride_id: f"#{ride_id} - {ride['name']} ({ride['start_date_str']})"
+            for ride_id, ride in rides_by_id.items()
+        }
         
         selected_ride_id = st.selectbox(
             "Select Ride for Pre-ride Report",
-            options=[option[1] for option in ride_options],
-            format_func=lambda x: next((option[0] for option in ride_options if option[1] == x), "")
+            options=list(ride_labels),
+            format_func=ride_labels.get
         )
         
-        selected_ride = next((ride for ride in upcoming_rides if ride['ride_id'] == selected_ride_id), None)
+        selected_ride = rides_by_id.get(selected_ride_id)
         
         if not selected_ride:
             st.warning("Please select a ride.")
             return
             
         st.markdown(f"## Pre-ride Report for: {selected_ride['name']}")
-        st.markdown(f"**Date:** {selected_ride['start_date'].strftime('%Y-%m-%d')} to {selected_ride['end_date'].strftime('%Y-%m-%d')}")
+        st.markdown(f"**Date:** {selected_ride['start_date_str']} to {selected_ride['end_date_str']}")
         
         # Get registered users for this ride
         registered_users = self.user_manager.get_registered_users_for_ride(selected_ride_id)
@@ -1419,28 +1701,14 @@ class Dashboard:
             st.warning("No riders have registered for this ride yet.")
             return  # Don't show any data if no riders registered
         
-        # Sort users by eligibility (highest to lowest)
-        eligibility_data = []
-        for user in registered_users:
-            eligibility = self._get_eligibility_status(user['_id'])
-            eligibility_score = (4 if eligibility['rp_eligible'] else 0) + \
-                            (2 if eligibility['lead_eligible'] else 0) + \
-                            (1 if eligibility['sweep_eligible'] else 0)
-            
-            eligibility_data.append({
-                'user': user,
-                'eligibility': eligibility,
-                'score': eligibility_score
-            })
-        
-        # Sort by eligibility score (descending)
-        eligibility_data.sort(key=lambda x: x['score'], reverse=True)
+        # Cached per ride; cleared when riders join/leave or attendance changes
+        report = self._compute_eligibility(selected_ride_id)
         
         # Overview stats
         total_registered = len(registered_users)
-        sweep_eligible_count = sum(1 for item in eligibility_data if item['eligibility']['sweep_eligible'])
-        lead_eligible_count = sum(1 for item in eligibility_data if item['eligibility']['lead_eligible'])
-        rp_eligible_count = sum(1 for item in eligibility_data if item['eligibility']['rp_eligible'])
+        sweep_eligible_count = len(report['sweep_eligible'])
+        lead_eligible_count = len(report['lead_eligible'])
+        rp_eligible_count = len(report['rp_eligible'])
         
         # Display overview stats
         col1, col2, col3, col4 = st.columns(4)
@@ -1453,127 +1721,103 @@ class Dashboard:
         with col4:
             st.metric("RP Eligible", rp_eligible_count)
         
-        # Create tabs for different roles
-        tabs = st.tabs(["All Riders", "Lead Eligible", "Sweep Eligible", "RP Eligible"])
+        self._show_preride_tabs(report)
+
+    @st.fragment
+    def _show_preride_tabs(self, report: Dict[str, Any]):
+        """Render the selected role view; interactions inside rerun only this fragment"""
+        eligibility_data = report['riders']
+        lead_eligible = report['lead_eligible']
+        sweep_eligible = report['sweep_eligible']
+        rp_eligible = report['rp_eligible']
         
-        with tabs[0]:
-            for item in eligibility_data:
-                user = item['user']
-                eligibility = item['eligibility']
-                stats = eligibility['stats']
-                
-                # Determine card color based on highest eligible role
-                card_color = "var(--bg-secondary)"  # default color
-                if eligibility['rp_eligible']:
-                    card_color = "rgba(234, 179, 8, 0.2)"  # yellow tint
-                elif eligibility['lead_eligible']:
-                    card_color = "rgba(59, 130, 246, 0.2)"  # blue tint
-                elif eligibility['sweep_eligible']:
-                    card_color = "rgba(34, 197, 94, 0.2)"  # green tint
-
-                st.markdown(f"""
-                <div style='
-                    background-color: {card_color};
-                    padding: 20px;
-                    border-radius: 10px;
-                    margin-bottom: 10px;
-                '>
-                    <h3>{user['name']}</h3>
-                    <div style='display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px;'>
-                        <div>
-                            <p><strong>Total Rides:</strong> {stats['total_rides']}</p>
-                            <p><strong>Total Sweeps:</strong> {stats['sweeps']}</p>
-                        </div>
-                        <div>
-                            <p><strong>Total Leads:</strong> {stats['leads']}</p>
-                            <p><strong>Running Pilot Days:</strong> {stats['running_pilots']}</p>
-                        </div>
-                    </div>
-                    <div style='margin-top: 10px;'>
-                        <p><strong>Eligible for:</strong></p>
-                        <p>
-                            {' 🟢 Sweep ' if eligibility['sweep_eligible'] else '❌ Sweep '}
-                            {' 🔵 Lead ' if eligibility['lead_eligible'] else '❌ Lead '}
-                            {' 🟡 Running Pilot ' if eligibility['rp_eligible'] else '❌ Running Pilot '}
-                        </p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                # Add emergency contact in expandable section
-                with st.expander("View Emergency Contact"):
-                    st.write(f"📞 Emergency Contact: {user['emergency_contact']}")
+        # Only the selected view is built (st.tabs would build all four every rerun)
+        selected_view = st.radio(
+            "View",
+            ["All Riders", "Lead Eligible", "Sweep Eligible", "RP Eligible"],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="preride_view"
+        )
+        
+        if selected_view == "All Riders":
+            show_contacts = st.checkbox("Show emergency contacts", key="preride_show_contacts")
+            contacts = self.user_manager.get_emergency_contacts(
+                tuple(item['user']['id_str'] for item in eligibility_data)
+            ) if show_contacts else {}
+            # One virtualized table instead of a card per rider; rows keep the eligibility order
+            table = {
+                "Name": [item['user']['name'] for item in eligibility_data],
+                "Total Rides": [item['eligibility']['stats']['total_rides'] for item in eligibility_data],
+                "Sweeps": [item['eligibility']['stats']['sweeps'] for item in eligibility_data],
+                "Leads": [item['eligibility']['stats']['leads'] for item in eligibility_data],
+                "RP Days": [item['eligibility']['stats']['running_pilots'] for item in eligibility_data],
+                "Sweep Eligible": [item['eligibility']['sweep_eligible'] for item in eligibility_data],
+                "Lead Eligible": [item['eligibility']['lead_eligible'] for item in eligibility_data],
+                "RP Eligible": [item['eligibility']['rp_eligible'] for item in eligibility_data],
+            }
+            if show_contacts:
+                table["Emergency Contact"] = [contacts.get(item['user']['id_str'], '') for item in eligibility_data]
+            st.dataframe(
+                table,
+                column_config={
+                    "Sweep Eligible": st.column_config.CheckboxColumn("🟢 Sweep"),
+                    "Lead Eligible": st.column_config.CheckboxColumn("🔵 Lead"),
+                    "RP Eligible": st.column_config.CheckboxColumn("🟡 Running Pilot"),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
         
-        # Lead Eligible Tab
-        with tabs[1]:
-            lead_eligible = [item for item in eligibility_data if item['eligibility']['lead_eligible']]
+        # Lead Eligible view
+        elif selected_view == "Lead Eligible":
             if not lead_eligible:
                 st.warning("No riders eligible for Lead role.")
             else:
                 st.success(f"{len(lead_eligible)} riders are eligible for Lead role.")
-                for item in lead_eligible:
-                    user = item['user']
-                    stats = item['eligibility']['stats']
-                    st.markdown(f"""
-                    <div style='
-                        background-color: rgba(59, 130, 246, 0.2);
-                        padding: 20px;
-                        border-radius: 10px;
-                        margin-bottom: 10px;
-                    '>
-                        <h3>{user['name']}</h3>
-                        <p><strong>Lead Qualification:</strong> {stats['sweeps']} sweeps (minimum 3 required)</p>
-                        <p><strong>Phone:</strong> {user['phone']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown("".join(
+                    _LEAD_CARD_TMPL(
+                        name=item['user']['name'],
+                        sweeps=item['eligibility']['stats']['sweeps'],
+                        phone=item['user']['phone']
+                    )
+                    for item in lead_eligible
+                ), unsafe_allow_html=True)
                     
-        # Sweep Eligible Tab
-        with tabs[2]:
-            sweep_eligible = [item for item in eligibility_data if item['eligibility']['sweep_eligible']]
+        # Sweep Eligible view
+        elif selected_view == "Sweep Eligible":
             if not sweep_eligible:
                 st.warning("No riders eligible for Sweep role.")
             else:
                 st.success(f"{len(sweep_eligible)} riders are eligible for Sweep role.")
-                for item in sweep_eligible:
-                    user = item['user']
-                    stats = item['eligibility']['stats']
-                    st.markdown(f"""
-                    <div style='
-                        background-color: rgba(34, 197, 94, 0.2);
-                        padding: 20px;
-                        border-radius: 10px;
-                        margin-bottom: 10px;
-                    '>
-                        <h3>{user['name']}</h3>
-                        <p><strong>Sweep Qualification:</strong> {stats['total_rides']} rides (minimum 10 required)</p>
-                        <p><strong>Phone:</strong> {user['phone']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown("".join(
+                    _SWEEP_CARD_TMPL(
+                        name=item['user']['name'],
+                        total_rides=item['eligibility']['stats']['total_rides'],
+                        phone=item['user']['phone']
+                    )
+                    for item in sweep_eligible
+                ), unsafe_allow_html=True)
         
-        # Running Pilot Eligible Tab
-        with tabs[3]:
-            rp_eligible = [item for item in eligibility_data if item['eligibility']['rp_eligible']]
+        # Running Pilot Eligible view
+        elif selected_view == "RP Eligible":
             if not rp_eligible:
                 st.warning("No riders eligible for Running Pilot role.")
             else:
                 st.success(f"{len(rp_eligible)} riders are eligible for Running Pilot role.")
-                for item in rp_eligible:
-                    user = item['user']
-                    stats = item['eligibility']['stats']
-                    st.markdown(f"""
-                    <div style='
-                        background-color: rgba(234, 179, 8, 0.2);
-                        padding: 20px;
-                        border-radius: 10px;
-                        margin-bottom: 10px;
-                    '>
-                        <h3>{user['name']}</h3>
-                        <p><strong>RP Qualification:</strong> {stats['sweeps']} sweeps and {stats['leads']} leads (minimum 3 each required)</p>
-                        <p><strong>Phone:</strong> {user['phone']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-
-def get_mongodb_uri():
+                st.markdown("".join(
+                    _RP_CARD_TMPL(
+                        name=item['user']['name'],
+                        sweeps=item['eligibility']['stats']['sweeps'],
+                        leads=item['eligibility']['stats']['leads'],
+                        phone=item['user']['phone']
+                    )
+                    for item in rp_eligible
+                ), unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_mongodb_uri() -> str:
     try:
         # Check the environment variable for the current mode
         environment = os.getenv("ENVIRONMENT", "production")
@@ -1618,50 +1862,93 @@ def get_mongodb_uri():
         st.error(f"Failed to get MongoDB URI: {str(e)}")
         raise e
 
+# Static login page panels
+_LOGIN_HERO_HTML = """
+<div style="text-align: center; margin-bottom: 30px;">
+    <h1 style="color: #7c3aed; font-size: 3rem; margin-bottom: 0;">🏍️ Bikers Club</h1>
+    <p style="font-size: 1.2rem; color: #a0a0a0;">Connect, Ride, Share Adventures</p>
+</div>
+"""
+_WHY_JOIN_HTML = """
+<div style="background: linear-gradient(135deg, rgba(124, 58, 237, 0.1), rgba(124, 58, 237, 0.3)); 
+            padding: 30px; border-radius: 15px; margin-bottom: 20px; height: 100%;">
+    <h2 style="color: #7c3aed; margin-bottom: 20px;">Why Join Bikers Creed?</h2>
+    <ul style="list-style-type: none; padding-left: 0;">
+        <li style="margin-bottom: 15px; display: flex; align-items: center;">
+            <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">🛣️</span> 
+            <span>Organized group rides with experienced leaders</span>
+        </li>
+        <li style="margin-bottom: 15px; display: flex; align-items: center;">
+            <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">👥</span> 
+            <span>Connect with fellow motorcycle enthusiasts</span>
+        </li>
+        <li style="margin-bottom: 15px; display: flex; align-items: center;">
+            <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">🏆</span> 
+            <span>Track your riding progress and achievements</span>
+        </li>
+        <li style="margin-bottom: 15px; display: flex; align-items: center;">
+            <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">🔒</span> 
+            <span>Safety-focused rides with experienced sweeps and pilots</span>
+        </li>
+    </ul>
+</div>
+"""
+
+# Riding history fields on the registration form, per column: (stats key, label)
+_PREVIOUS_STAT_COLUMNS = (
+    (("total_rides", "Previous Rides"), ("sweeps", "Previous Sweeps"), ("leads", "Previous Leads")),
+    (("running_pilots", "Previous Running Pilots"), ("ride_marshals", "Previous Ride Marshals"))
+)
+
 def reset_password(email_or_phone, new_password, user_manager):
     """Utility function to reset a user's password"""
     try:
-        # Find the user
-        user = user_manager.db_manager.find_document(
+        # Hash the new password
+        hashed_password = hash_password(new_password)
+        
+        # Find the user and update the password in a single operation
+        user = user_manager.db_manager.find_and_update_document(
             "users",
-            {"$or": [{"phone": email_or_phone}, {"email": email_or_phone}]}
+            {"$or": [{"phone": email_or_phone}, {"email": email_or_phone}]},
+            {"password": hashed_password},
+            projection={"_id": 1}
         )
         
         if not user:
             return False, "User not found. Please check your email or phone number."
         
-        # Hash the new password
-        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
-        
-        # Update the password
-        result = user_manager.db_manager.update_document(
-            "users",
-            {"_id": user["_id"]},
-            {"password": hashed_password}
-        )
-        
-        if result.modified_count > 0:
-            return True, "Password reset successfully. You can now login with your new password."
-        else:
-            return False, "Failed to reset password. Please try again."
+        return True, "Password reset successfully. You can now login with your new password."
             
     except Exception as e:
         logging.error(f"Error resetting password: {str(e)}")
         return False, f"An error occurred: {str(e)}"
         
+@st.cache_resource
+def get_db_manager() -> DatabaseManager:
+    """Open the MongoDB connection once per process"""
+    return DatabaseManager(
+        uri=get_mongodb_uri(),
+        db_name="bikers_club"
+    )
+
+@st.cache_resource
+def get_managers():
+    """Build the managers once per process on top of the shared connection"""
+    db_manager = get_db_manager()
+    user_manager = UserManager(db_manager)
+    ride_manager = RideManager(db_manager)
+    ride_manager.ensure_participation_counters()
+    ride_manager.schedule_archiving()
+    ride_manager.watch_ride_changes()
+    dashboard = Dashboard(user_manager, ride_manager)
+    return user_manager, ride_manager, dashboard
+
 def main():
     st.set_page_config(page_title="Bikers Creed", page_icon="🏍️", layout="wide")
     
     try:
-        # Initialize managers with the configured URI
-        mongodb_uri = get_mongodb_uri()
-        db_manager = DatabaseManager(
-            uri=mongodb_uri,
-            db_name="bikers_club"
-        )
-        user_manager = UserManager(db_manager)
-        ride_manager = RideManager(db_manager)
-        dashboard = Dashboard(user_manager, ride_manager)
+        # Initialize managers with the configured URI (reused across reruns)
+        user_manager, ride_manager, dashboard = get_managers()
     except Exception as e:
         st.error("Failed to initialize application. Please check your configuration.")
         st.exception(e)
@@ -1680,41 +1967,13 @@ def main():
         st.rerun()
 
     if st.session_state.user is None:
-        st.markdown("""
-        <div style="text-align: center; margin-bottom: 30px;">
-            <h1 style="color: #7c3aed; font-size: 3rem; margin-bottom: 0;">🏍️ Bikers Club</h1>
-            <p style="font-size: 1.2rem; color: #a0a0a0;">Connect, Ride, Share Adventures</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_LOGIN_HERO_HTML, unsafe_allow_html=True)
         
         # Create column layout for a better visual design
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            st.markdown("""
-            <div style="background: linear-gradient(135deg, rgba(124, 58, 237, 0.1), rgba(124, 58, 237, 0.3)); 
-                        padding: 30px; border-radius: 15px; margin-bottom: 20px; height: 100%;">
-                <h2 style="color: #7c3aed; margin-bottom: 20px;">Why Join Bikers Creed?</h2>
-                <ul style="list-style-type: none; padding-left: 0;">
-                    <li style="margin-bottom: 15px; display: flex; align-items: center;">
-                        <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">🛣️</span> 
-                        <span>Organized group rides with experienced leaders</span>
-                    </li>
-                    <li style="margin-bottom: 15px; display: flex; align-items: center;">
-                        <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">👥</span> 
-                        <span>Connect with fellow motorcycle enthusiasts</span>
-                    </li>
-                    <li style="margin-bottom: 15px; display: flex; align-items: center;">
-                        <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">🏆</span> 
-                        <span>Track your riding progress and achievements</span>
-                    </li>
-                    <li style="margin-bottom: 15px; display: flex; align-items: center;">
-                        <span style="color: #7c3aed; font-size: 1.5rem; margin-right: 10px;">🔒</span> 
-                        <span>Safety-focused rides with experienced sweeps and pilots</span>
-                    </li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_WHY_JOIN_HTML, unsafe_allow_html=True)
         
         with col2:
             tab1, tab2, tab3 = st.tabs(["Login", "Register", "Forgot Password"])
@@ -1763,31 +2022,12 @@ def main():
                         st.info("If you were using the previous Creedbot system, enter your riding history below to migrate your stats.")
                         
                         is_existing = True  # Set to true when this section is used
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            previous_rides = st.number_input("Previous Rides", 
-                                                            min_value=0, 
-                                                            value=0)
-                            sweeps = st.number_input("Previous Sweeps", 
-                                                    min_value=0, 
-                                                    value=0)
-                            leads = st.number_input("Previous Leads", 
-                                                    min_value=0, 
-                                                    value=0)
-                        with col2:
-                            running_pilots = st.number_input("Previous Running Pilots", 
-                                                            min_value=0, 
-                                                            value=0)
-                            ride_marshals = st.number_input("Previous Ride Marshals", 
-                                                            min_value=0, 
-                                                            value=0)
-                        
-                        previous_stats = {
-                            "sweeps": sweeps,
-                            "leads": leads,
-                            "running_pilots": running_pilots,
-                            "ride_marshals": ride_marshals
-                        }
+                        previous_stats = {}
+                        for column, fields in zip(st.columns(2), _PREVIOUS_STAT_COLUMNS):
+                            with column:
+                                for field, label in fields:
+                                    previous_stats[field] = st.number_input(label, min_value=0, value=0)
+                        previous_rides = previous_stats.pop("total_rides")
                     
                     # Registration button
                     if st.form_submit_button("Register", use_container_width=True):
@@ -1803,8 +2043,7 @@ def main():
                             else:
                                 # Determine if user is from previous system
                                 is_from_previous = st.session_state.get('_is_expander_open', False) and (
-                                    previous_rides > 0 or sweeps > 0 or leads > 0 or 
-                                    running_pilots > 0 or ride_marshals > 0
+                                    previous_rides > 0 or any(count > 0 for count in previous_stats.values())
                                 )
                                 
                                 # Create user